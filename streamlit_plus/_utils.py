@@ -0,0 +1,145 @@
+"""
+Internal helpers shared across Streamlit++ modules.
+"""
+
+import hashlib
+import pickle
+import sys
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Any, List, Optional, Union
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+# Scratch state of the script run executing on this thread
+_run = threading.local()
+
+# Stylesheets queued by an open layout_batch. Each session runs its script in
+# its own thread, so a batch only ever sees the calls made inside its block
+_batch = threading.local()
+
+
+def _script_namespace() -> Optional[dict]:
+    """
+    Globals of the Streamlit script running on this thread, or None.
+
+    Streamlit executes every run in a fresh ``__main__`` module, so the
+    namespace of the nearest module-level ``__main__`` frame identifies the run.
+    """
+    if get_script_run_ctx() is None:
+        return None
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_name == "<module>" and frame.f_globals.get("__name__") == "__main__":
+            return frame.f_globals
+        frame = frame.f_back
+    return None
+
+
+def _run_state() -> Optional[dict]:
+    """
+    Scratch dict that lives for the current script run.
+
+    Returns:
+        The dict for this run, or None when called outside a script run
+    """
+    namespace = _script_namespace()
+    if namespace is None:
+        return None
+    if getattr(_run, "namespace", None) is not namespace:
+        _run.namespace, _run.state = namespace, {}
+    return _run.state
+
+
+def _css_buffer() -> Optional[List[str]]:
+    """
+    Pending CSS of the layout_batch open on this thread, or None.
+    """
+    return getattr(_batch, "buffer", None)
+
+
+@contextmanager
+def _collect_css():
+    """
+    Queue the CSS emitted inside the block and yield the queued rules.
+
+    Nested blocks share the outer block's queue and yield None.
+    """
+    if _css_buffer() is not None:
+        yield None
+        return
+
+    _batch.buffer = []
+    try:
+        yield _batch.buffer
+    finally:
+        _batch.buffer = None
+
+
+def _uid(prefix: str, *parts: Any) -> str:
+    """
+    Return an element ID such as 'btn-1a2b3c4d'.
+
+    The suffix is a checksum of the given parts, so a call with the same
+    arguments yields the same ID on every rerun. Like Streamlit widget keys,
+    two calls with identical arguments get the same ID.
+    """
+    digest = zlib.crc32(repr(parts).encode("utf-8"))
+    return f"{prefix}-{digest:08x}"
+
+
+def _inject_css(key: str, css: str):
+    """
+    Emit a shared stylesheet at most once per script run.
+
+    Args:
+        key: Identifier of the stylesheet
+        css: CSS rules (without the surrounding <style> tag)
+    """
+    state = _run_state()
+    if state is not None:
+        injected = state.setdefault("css", set())
+        if key in injected:
+            return
+        injected.add(key)
+
+    _emit_css(css)
+
+
+def _emit_css(css: str):
+    """
+    Send CSS rules to the page, or queue them while a layout_batch is open.
+
+    Args:
+        css: CSS rules (without the surrounding <style> tag)
+    """
+    buffer = _css_buffer()
+    if buffer is not None:
+        buffer.append(css)
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+def _df_fingerprint(df: Union[pd.DataFrame, pd.Series]) -> tuple:
+    """
+    Content key for caching on a DataFrame or Series.
+
+    Hashes every row, index label included, with pandas' vectorized
+    hash_pandas_object; unlike st.cache_data's default, large frames are not
+    sampled, so an edit to any row invalidates the cache.
+    """
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    except TypeError:  # unhashable cells such as lists
+        return tuple(df.columns), pickle.dumps(df)
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+    return tuple(df.columns), tuple(map(str, df.dtypes)), len(df), digest
+
+
+_DF_HASH_FUNCS = {pd.DataFrame: _df_fingerprint, pd.Series: _df_fingerprint}
@@ -5,9 +5,32 @@ Provides micro-interactions, page transitions, element animations, and loading s
 """
 
 import streamlit as st
+from types import MappingProxyType
 from typing import Optional, List, Dict, Any, Callable
 import time
-import uuid
+
+from ._utils import _uid
+
+
+_SLIDE_TRANSFORMS = MappingProxyType({
+    "up": "translateY(20px)",
+    "down": "translateY(-20px)",
+    "left": "translateX(20px)",
+    "right": "translateX(-20px)"
+})
+
+_SPINNER_SIZES = MappingProxyType({
+    "small": "width: 20px; height: 20px; border-width: 2px;",
+    "medium": "width: 40px; height: 40px; border-width: 4px;",
+    "large": "width: 60px; height: 60px; border-width: 6px;"
+})
+
+_SPINNER_COLORS = MappingProxyType({
+    "primary": "var(--primary-color, #007bff)",
+    "secondary": "var(--secondary-color, #6c757d)",
+    "success": "var(--success-color, #28a745)",
+    "danger": "var(--danger-color, #dc3545)"
+})
 
 
 def fade_in(content: Any, duration: float = 0.5, delay: float = 0, **kwargs):
@@ -20,7 +43,7 @@ def fade_in(content: Any, duration: float = 0.5, delay: float = 0, **kwargs):
         delay: Animation delay in seconds
         **kwargs: Additional styling
     """
-    element_id = f"fade-in-{uuid.uuid4().hex[:8]}"
+    element_id = _uid("fade-in", duration, delay)
     anim_name = f"fadeIn{element_id.replace('-', '')}"
 
     style = f"""
@@ -52,22 +75,15 @@ def slide_in(content: Any, direction: str = "up", duration: float = 0.5, delay:
         delay: Animation delay in seconds
         **kwargs: Additional styling
     """
-    element_id = f"slide-in-{uuid.uuid4().hex[:8]}"
+    element_id = _uid("slide-in", direction, duration, delay)
     anim_name = f"slideIn{element_id.replace('-', '')}"
 
-    transforms = {
-        "up": "translateY(20px)",
-        "down": "translateY(-20px)",
-        "left": "translateX(20px)",
-        "right": "translateX(-20px)"
-    }
-
     style = f"""
     <style>
     @keyframes {anim_name} {{
         from {{
             opacity: 0;
-            transform: {transforms.get(direction, transforms['up'])};
+            transform: {_SLIDE_TRANSFORMS.get(direction, _SLIDE_TRANSFORMS['up'])};
         }}
         to {{
             opacity: 1;
@@ -96,7 +112,7 @@ def bounce_in(content: Any, duration: float = 0.8, delay: float = 0, **kwargs):
         delay: Animation delay in seconds
         **kwargs: Additional styling
     """
-    element_id = f"bounce-in-{uuid.uuid4().hex[:8]}"
+    element_id = _uid("bounce-in", duration, delay)
     anim_name = f"bounceIn{element_id.replace('-', '')}"
 
     style = f"""
@@ -139,7 +155,7 @@ def pulse(content: Any, duration: float = 2, **kwargs):
         duration: Animation duration in seconds
         **kwargs: Additional styling
     """
-    element_id = f"pulse-{uuid.uuid4().hex[:8]}"
+    element_id = _uid("pulse", duration)
     anim_name = f"pulse{element_id.replace('-', '')}"
 
     style = f"""
@@ -176,27 +192,14 @@ def loading_spinner(size: str = "medium", color: str = "primary", **kwargs):
         color: Spinner color
         **kwargs: Additional styling
     """
-    sizes = {
-        "small": "width: 20px; height: 20px; border-width: 2px;",
-        "medium": "width: 40px; height: 40px; border-width: 4px;",
-        "large": "width: 60px; height: 60px; border-width: 6px;"
-    }
-
-    colors = {
-        "primary": "var(--primary-color, #007bff)",
-        "secondary": "var(--secondary-color, #6c757d)",
-        "success": "var(--success-color, #28a745)",
-        "danger": "var(--danger-color, #dc3545)"
-    }
-
-    spinner_id = f"spinner-{uuid.uuid4().hex[:8]}"
+    spinner_id = _uid("spinner", size, color)
     anim_name = f"spin{spinner_id.replace('-', '')}"
 
     style = f"""
     <style>
     #{spinner_id} {{
-        {sizes.get(size, sizes['medium'])}
-        border: {colors.get(color, colors['primary'])} solid;
+        {_SPINNER_SIZES.get(size, _SPINNER_SIZES['medium'])}
+        border: {_SPINNER_COLORS.get(color, _SPINNER_COLORS['primary'])} solid;
         border-top: transparent solid;
         border-radius: 50%;
         animation: {anim_name} 1s linear infinite;
@@ -223,8 +226,8 @@ def skeleton_loader(width: str = "100%", height: str = "20px", **kwargs):
         height: Skeleton height
         **kwargs: Additional styling
     """
-    skeleton_id = f"skeleton-{uuid.uuid4().hex[:8]}"
-    anim_name = f"loading{uuid.uuid4().hex[:8]}"
+    skeleton_id = _uid("skeleton", width, height)
+    anim_name = _uid("loading")
 
     style = f"""
     <style>
@@ -260,8 +263,8 @@ def shimmer_effect(content: Any, **kwargs):
         content: Content to apply shimmer to
         **kwargs: Additional styling
     """
-    shimmer_id = f"shimmer-{uuid.uuid4().hex[:8]}"
-    anim_name = f"shimmer{uuid.uuid4().hex[:8]}"
+    shimmer_id = _uid("shimmer")
+    anim_name = f"{shimmer_id}-sweep"
 
     style = f"""
     <style>
@@ -328,7 +331,7 @@ def page_transition(content: Any, transition_type: str = "fade", duration: float
         duration: Transition duration
         **kwargs: Additional options
     """
-    transition_id = f"transition-{uuid.uuid4().hex[:8]}"
+    transition_id = _uid("transition", transition_type, duration)
 
     if transition_type == "fade":
         anim_name = f"pageFade{int(duration * 1000)}"
@@ -390,7 +393,7 @@ def counter_animation(start: int, end: int, duration: float = 2, prefix: str = "
         suffix: Text suffix
         **kwargs: Additional options
     """
-    counter_id = f"counter-{uuid.uuid4().hex[:8]}"
+    counter_id = _uid("counter", start, end)
 
     # For simplicity, we'll just display the end value
     # A full implementation would use JavaScript for smooth counting
@@ -5,11 +5,121 @@ Provides a library of polished UI components including modals, tooltips, cards,
 """
 
 import streamlit as st
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Optional, List, Dict, Any, Callable
-import uuid
+import io
+import numpy as np
+import pandas as pd
 
+from ._utils import _DF_HASH_FUNCS, _df_fingerprint, _inject_css, _uid
 
-def card(title: str, content: Any, actions: Optional[List[Dict]] = None, elevation: int = 1, **kwargs):
+
+@dataclass(frozen=True)
+class ButtonOpts:
+    """
+    Reusable styling options for :func:`button`.
+
+    Build one instance per app and pass it to every button that shares the style.
+    """
+    variant: str = "filled"
+    size: str = "medium"
+
+
+_SHADOW_LEVELS = MappingProxyType({
+    1: "0 1px 3px rgba(0,0,0,0.12)",
+    2: "0 3px 6px rgba(0,0,0,0.16)",
+    3: "0 10px 20px rgba(0,0,0,0.19)",
+    4: "0 14px 28px rgba(0,0,0,0.25)",
+    5: "0 19px 38px rgba(0,0,0,0.30)"
+})
+
+_BUTTON_SIZES = MappingProxyType({
+    "small": "padding: 0.5rem 1rem; font-size: 0.875rem;",
+    "medium": "padding: 0.75rem 1.5rem; font-size: 1rem;",
+    "large": "padding: 1rem 2rem; font-size: 1.125rem;"
+})
+
+_BUTTON_VARIANTS = MappingProxyType({
+    "filled": "background: var(--primary-color, #007bff); color: white; border: none;",
+    "outlined": "background: transparent; color: var(--primary-color, #007bff); border: 1px solid var(--primary-color, #007bff);",
+    "text": "background: transparent; color: var(--primary-color, #007bff); border: none;"
+})
+
+_MODAL_SIZES = MappingProxyType({
+    "small": "width: 300px; height: 200px;",
+    "medium": "width: 500px; height: 400px;",
+    "large": "width: 800px; height: 600px;",
+    "fullscreen": "width: 100vw; height: 100vh;"
+})
+
+# Icon plus separating space, prepended to notification messages
+_NOTIFICATION_PREFIXES = MappingProxyType({
+    "info": "ℹ️ ",
+    "success": "✅ ",
+    "warning": "⚠️ ",
+    "error": "❌ "
+})
+
+_BADGE_COLORS = MappingProxyType({
+    "primary": "var(--primary-color, #007bff)",
+    "secondary": "var(--secondary-color, #6c757d)",
+    "success": "var(--success-color, #28a745)",
+    "danger": "var(--danger-color, #dc3545)",
+    "warning": "var(--warning-color, #ffc107)",
+    "info": "var(--info-color, #17a2b8)"
+})
+
+_BADGE_SIZES = MappingProxyType({
+    "small": "padding: 0.25rem 0.5rem; font-size: 0.75rem;",
+    "medium": "padding: 0.375rem 0.75rem; font-size: 0.875rem;",
+    "large": "padding: 0.5rem 1rem; font-size: 1rem;"
+})
+
+_CHIP_SIZES = MappingProxyType({
+    "small": "padding: 0.25rem 0.75rem; font-size: 0.75rem;",
+    "medium": "padding: 0.375rem 1rem; font-size: 0.875rem;",
+    "large": "padding: 0.5rem 1.25rem; font-size: 1rem;"
+})
+
+_PROGRESS_COLORS = MappingProxyType({
+    "primary": "var(--primary-color, #007bff)",
+    "success": "var(--success-color, #28a745)",
+    "warning": "var(--warning-color, #ffc107)",
+    "danger": "var(--danger-color, #dc3545)"
+})
+
+_PROGRESS_SIZES = MappingProxyType({
+    "small": "height: 4px;",
+    "medium": "height: 8px;",
+    "large": "height: 12px;"
+})
+
+# Static stylesheet shared by every badge, chip and progress bar; components
+# only reference these classes, so the CSS is emitted once per run
+_COMPONENT_CSS = "".join([
+    ".stp-badge { color: white; border-radius: 12px; display: inline-block; "
+    "font-weight: 500; text-align: center; }",
+    *(f".stp-badge-{name} {{ background: {color}; }}" for name, color in _BADGE_COLORS.items()),
+    *(f".stp-badge-{name} {{ {rule} }}" for name, rule in _BADGE_SIZES.items()),
+    ".stp-chip { border-radius: 16px; display: inline-flex; align-items: center; "
+    "gap: 0.5rem; font-weight: 500; cursor: default; }",
+    ".stp-chip-filled { background: var(--primary-color, #007bff); color: white; border: none; }",
+    ".stp-chip-outlined { background: transparent; color: var(--primary-color, #007bff); "
+    "border: 1px solid var(--primary-color, #007bff); }",
+    *(f".stp-chip-{name} {{ {rule} }}" for name, rule in _CHIP_SIZES.items()),
+    ".stp-chip .remove-btn { background: none; border: none; color: inherit; cursor: pointer; "
+    "padding: 0; margin-left: 0.25rem; font-size: 1.2em; line-height: 1; }",
+    ".stp-progress { width: 100%; background: var(--text-secondary-color, #e0e0e0); "
+    "border-radius: 4px; overflow: hidden; }",
+    *(f".stp-progress-{name} {{ {rule} }}" for name, rule in _PROGRESS_SIZES.items()),
+    ".stp-progress .progress-fill { height: 100%; transition: width 0.3s ease; }",
+    *(f".stp-progress-{name} .progress-fill {{ background: {color}; }}"
+      for name, color in _PROGRESS_COLORS.items()),
+])
+
+
+def card(title: str, content: Any, actions: Optional[List[Dict]] = None, elevation: int = 1):
     """
     Create a customizable card component.
 
@@ -18,23 +128,14 @@ def card(title: str, content: Any, actions: Optional[List[Dict]] = None, elevati
         content: Card content
         actions: List of action buttons [{'label': 'Action', 'on_click': func}]
         elevation: Shadow elevation level (1-5)
-        **kwargs: Additional styling
     """
-    shadow_levels = {
-        1: "0 1px 3px rgba(0,0,0,0.12)",
-        2: "0 3px 6px rgba(0,0,0,0.16)",
-        3: "0 10px 20px rgba(0,0,0,0.19)",
-        4: "0 14px 28px rgba(0,0,0,0.25)",
-        5: "0 19px 38px rgba(0,0,0,0.30)"
-    }
-
     st.markdown(f"""
     <div style="
         background: var(--surface-color, white);
         border-radius: 8px;
         padding: 1rem;
         margin: 1rem 0;
-        box-shadow: {shadow_levels.get(elevation, shadow_levels[1])};
+        box-shadow: {_SHADOW_LEVELS.get(elevation, _SHADOW_LEVELS[1])};
         border: 1px solid var(--text-secondary-color, #e0e0e0);
     ">
         <h3 style="margin-top: 0; color: var(--text-color, #212529);">{title}</h3>
@@ -49,7 +150,8 @@ def card(title: str, content: Any, actions: Optional[List[Dict]] = None, elevati
                 action.get('on_click', lambda: None)()
 
 
-def button(label: str, variant: str = "filled", size: str = "medium", on_click: Optional[Callable] = None, **kwargs):
+def button(label: str, variant: str = "filled", size: str = "medium", on_click: Optional[Callable] = None,
+           opts: Optional[ButtonOpts] = None, **kwargs):
     """
     Enhanced button with variants and sizes.
 
@@ -58,26 +160,18 @@ def button(label: str, variant: str = "filled", size: str = "medium", on_click:
         variant: 'filled', 'outlined', 'text'
         size: 'small', 'medium', 'large'
         on_click: Click handler
-        **kwargs: Additional properties
+        opts: Shared ButtonOpts; overrides variant and size when given
+        **kwargs: Additional properties passed to st.button
     """
-    sizes = {
-        "small": "padding: 0.5rem 1rem; font-size: 0.875rem;",
-        "medium": "padding: 0.75rem 1.5rem; font-size: 1rem;",
-        "large": "padding: 1rem 2rem; font-size: 1.125rem;"
-    }
+    if opts is not None:
+        variant, size = opts.variant, opts.size
 
-    variants = {
-        "filled": "background: var(--primary-color, #007bff); color: white; border: none;",
-        "outlined": "background: transparent; color: var(--primary-color, #007bff); border: 1px solid var(--primary-color, #007bff);",
-        "text": "background: transparent; color: var(--primary-color, #007bff); border: none;"
-    }
-
-    button_id = f"btn-{uuid.uuid4().hex[:8]}"
+    button_id = _uid("btn", label, variant, size)
     style = f"""
     <style>
     #{button_id} {{
-        {sizes.get(size, sizes['medium'])}
-        {variants.get(variant, variants['filled'])}
+        {_BUTTON_SIZES.get(size, _BUTTON_SIZES['medium'])}
+        {_BUTTON_VARIANTS.get(variant, _BUTTON_VARIANTS['filled'])}
         border-radius: 4px;
         cursor: pointer;
         transition: all 0.2s;
@@ -96,7 +190,7 @@ def button(label: str, variant: str = "filled", size: str = "medium", on_click:
             on_click()
 
 
-def modal(title: str, content: Any, is_open: bool = False, size: str = "medium", **kwargs):
+def modal(title: str, content: Any, is_open: bool = False, size: str = "medium"):
     """
     Create a modal dialog.
 
@@ -105,18 +199,10 @@ def modal(title: str, content: Any, is_open: bool = False, size: str = "medium",
         content: Modal content
         is_open: Whether modal is open
         size: 'small', 'medium', 'large', 'fullscreen'
-        **kwargs: Additional options
     """
     if is_open:
-        sizes = {
-            "small": "width: 300px; height: 200px;",
-            "medium": "width: 500px; height: 400px;",
-            "large": "width: 800px; height: 600px;",
-            "fullscreen": "width: 100vw; height: 100vh;"
-        }
-
-        modal_id = f"modal-{uuid.uuid4().hex[:8]}"
-        overlay_id = f"modal-overlay-{uuid.uuid4().hex[:8]}"
+        modal_id = _uid("modal", title, size)
+        overlay_id = _uid("modal-overlay", title, size)
 
         st.markdown(f"""
         <style>
@@ -132,7 +218,7 @@ def modal(title: str, content: Any, is_open: bool = False, size: str = "medium",
         }}
         #{modal_id} {{
             background: var(--surface-color, white);
-            {sizes.get(size, sizes['medium'])}
+            {_MODAL_SIZES.get(size, _MODAL_SIZES['medium'])}
             border-radius: 8px;
             padding: 1rem;
             box-shadow: 0 10px 25px rgba(0,0,0,0.2);
@@ -170,7 +256,7 @@ def tooltip(text: str, content: Any, position: str = "top", **kwargs):
     st.markdown(f'<span title="{text}">{content}</span>', unsafe_allow_html=True)
 
 
-def badge(text: str, variant: str = "primary", size: str = "medium", **kwargs):
+def badge(text: str, variant: str = "primary", size: str = "medium"):
     """
     Create a badge component.
 
@@ -178,52 +264,24 @@ def badge(text: str, variant: str = "primary", size: str = "medium", **kwargs):
         text: Badge text
         variant: 'primary', 'secondary', 'success', 'danger', 'warning', 'info'
         size: 'small', 'medium', 'large'
-        **kwargs: Additional styling
-    """
-    colors = {
-        "primary": "var(--primary-color, #007bff)",
-        "secondary": "var(--secondary-color, #6c757d)",
-        "success": "var(--success-color, #28a745)",
-        "danger": "var(--danger-color, #dc3545)",
-        "warning": "var(--warning-color, #ffc107)",
-        "info": "var(--info-color, #17a2b8)"
-    }
-
-    sizes = {
-        "small": "padding: 0.25rem 0.5rem; font-size: 0.75rem;",
-        "medium": "padding: 0.375rem 0.75rem; font-size: 0.875rem;",
-        "large": "padding: 0.5rem 1rem; font-size: 1rem;"
-    }
-
-    badge_id = f"badge-{uuid.uuid4().hex[:8]}"
-    style = f"""
-    <style>
-    #{badge_id} {{
-        {sizes.get(size, sizes['medium'])}
-        background: {colors.get(variant, colors['primary'])};
-        color: white;
-        border-radius: 12px;
-        display: inline-block;
-        font-weight: 500;
-        text-align: center;
-    }}
-    </style>
     """
+    variant = variant if variant in _BADGE_COLORS else "primary"
+    size = size if size in _BADGE_SIZES else "medium"
 
-    st.markdown(style, unsafe_allow_html=True)
-    st.markdown(f'<span id="{badge_id}">{text}</span>', unsafe_allow_html=True)
+    _inject_css("components", _COMPONENT_CSS)
+    st.markdown(f'<span class="stp-badge stp-badge-{variant} stp-badge-{size}">{text}</span>',
+                unsafe_allow_html=True)
 
 
-def breadcrumb(items: List[Dict[str, Any]], separator: str = "/", **kwargs):
+def breadcrumb(items: List[Dict[str, Any]], separator: str = "/"):
     """
     Create a breadcrumb navigation.
 
     Args:
         items: List of breadcrumb items [{'label': 'Home', 'href': '#', 'active': False}]
         separator: Separator between items
-        **kwargs: Additional styling
     """
-    breadcrumb_id = f"breadcrumb-{uuid.uuid4().hex[:8]}"
+    breadcrumb_id = _uid("breadcrumb", separator)
 
     style = f"""
     <style>
@@ -248,23 +306,21 @@ def breadcrumb(items: List[Dict[str, Any]], separator: str = "/", **kwargs):
     </style>
     """
 
-    st.markdown(style, unsafe_allow_html=True)
-
-    breadcrumb_html = f'<nav id="{breadcrumb_id}" aria-label="breadcrumb">'
+    parts = [style, f'<nav id="{breadcrumb_id}" aria-label="breadcrumb">']
     for i, item in enumerate(items):
         if i > 0:
-            breadcrumb_html += f'<span>{separator}</span>'
+            parts.append(f'<span>{separator}</span>')
         if item.get('active', False):
-            breadcrumb_html += f'<span class="active">{item["label"]}</span>'
+            parts.append(f'<span class="active">{item["label"]}</span>')
         else:
             href = item.get('href', '#')
-            breadcrumb_html += f'<a href="{href}">{item["label"]}</a>'
-    breadcrumb_html += '</nav>'
+            parts.append(f'<a href="{href}">{item["label"]}</a>')
+    parts.append('</nav>')
 
-    st.markdown(breadcrumb_html, unsafe_allow_html=True)
+    st.markdown("".join(parts), unsafe_allow_html=True)
 
 
-def chip(label: str, variant: str = "outlined", size: str = "medium", removable: bool = False, on_remove: Optional[Callable] = None, **kwargs):
+def chip(label: str, variant: str = "outlined", size: str = "medium", removable: bool = False, on_remove: Optional[Callable] = None):
     """
     Create a chip component.
 
@@ -274,58 +330,22 @@ def chip(label: str, variant: str = "outlined", size: str = "medium", removable:
         size: 'small', 'medium', 'large'
         removable: Whether chip can be removed
         on_remove: Callback when remove button is clicked
-        **kwargs: Additional styling
     """
-    sizes = {
-        "small": "padding: 0.25rem 0.75rem; font-size: 0.75rem;",
-        "medium": "padding: 0.375rem 1rem; font-size: 0.875rem;",
-        "large": "padding: 0.5rem 1.25rem; font-size: 1rem;"
-    }
+    variant = "filled" if variant == "filled" else "outlined"
+    size = size if size in _CHIP_SIZES else "medium"
 
-    chip_id = f"chip-{uuid.uuid4().hex[:8]}"
-    bg_color = "var(--primary-color, #007bff)" if variant == "filled" else "transparent"
-    text_color = "white" if variant == "filled" else "var(--primary-color, #007bff)"
-    border = "none" if variant == "filled" else f"1px solid var(--primary-color, #007bff)"
-
-    style = f"""
-    <style>
-    #{chip_id} {{
-        {sizes.get(size, sizes['medium'])}
-        background: {bg_color};
-        color: {text_color};
-        border: {border};
-        border-radius: 16px;
-        display: inline-flex;
-        align-items: center;
-        gap: 0.5rem;
-        font-weight: 500;
-        cursor: default;
-    }}
-    #{chip_id} .remove-btn {{
-        background: none;
-        border: none;
-        color: inherit;
-        cursor: pointer;
-        padding: 0;
-        margin-left: 0.25rem;
-        font-size: 1.2em;
-        line-height: 1;
-    }}
-    </style>
-    """
-
-    st.markdown(style, unsafe_allow_html=True)
+    _inject_css("components", _COMPONENT_CSS)
 
     remove_html = ""
     if removable:
-        remove_btn_id = f"remove-{chip_id}"
-        remove_html = f'<button class="remove-btn" id="{remove_btn_id}">×</button>'
+        remove_html = '<button class="remove-btn">×</button>'
         # Note: In a real implementation, you'd need JavaScript for the remove functionality
 
-    st.markdown(f'<span id="{chip_id}">{label}{remove_html}</span>', unsafe_allow_html=True)
+    st.markdown(f'<span class="stp-chip stp-chip-{variant} stp-chip-{size}">{label}{remove_html}</span>',
+                unsafe_allow_html=True)
 
 
-def progress_bar(value: float, label: Optional[str] = None, color: str = "primary", size: str = "medium", **kwargs):
+def progress_bar(value: float, label: Optional[str] = None, color: str = "primary", size: str = "medium"):
     """
     Create a progress bar.
 
@@ -334,62 +354,29 @@ def progress_bar(value: float, label: Optional[str] = None, color: str = "primar
         label: Optional label
         color: Progress color
         size: Bar size
-        **kwargs: Additional styling
     """
-    colors = {
-        "primary": "var(--primary-color, #007bff)",
-        "success": "var(--success-color, #28a745)",
-        "warning": "var(--warning-color, #ffc107)",
-        "danger": "var(--danger-color, #dc3545)"
-    }
-
-    sizes = {
-        "small": "height: 4px;",
-        "medium": "height: 8px;",
-        "large": "height: 12px;"
-    }
-
-    progress_id = f"progress-{uuid.uuid4().hex[:8]}"
+    color = color if color in _PROGRESS_COLORS else "primary"
+    size = size if size in _PROGRESS_SIZES else "medium"
     percentage = min(max(value * 100, 0), 100)
 
-    style = f"""
-    <style>
-    #{progress_id} {{
-        width: 100%;
-        {sizes.get(size, sizes['medium'])}
-        background: var(--text-secondary-color, #e0e0e0);
-        border-radius: 4px;
-        overflow: hidden;
-    }}
-    #{progress_id} .progress-fill {{
-        height: 100%;
-        width: {percentage}%;
-        background: {colors.get(color, colors['primary'])};
-        transition: width 0.3s ease;
-    }}
-    </style>
-    """
-
-    st.markdown(style, unsafe_allow_html=True)
-
-    if label:
-        st.markdown(f"**{label}**")
+    label_html = f"<p><strong>{label}</strong></p>" if label else ""
 
+    _inject_css("components", _COMPONENT_CSS)
     st.markdown(f"""
-    <div id="{progress_id}">
-        <div class="progress-fill"></div>
+    {label_html}
+    <div class="stp-progress stp-progress-{color} stp-progress-{size}">
+        <div class="progress-fill" style="width: {percentage}%;"></div>
     </div>
     """, unsafe_allow_html=True)
 
 
-def tabs(tabs_data: List[Dict[str, Any]], default_active: int = 0, **kwargs):
+def tabs(tabs_data: List[Dict[str, Any]], default_active: int = 0):
     """
     Create enhanced tabs with icons.
 
     Args:
         tabs_data: List of tab data [{'label': 'Tab 1', 'icon': '📊', 'content': func}]
         default_active: Default active tab index
-        **kwargs: Additional styling
     """
     tab_labels = [f"{tab.get('icon', '')} {tab['label']}" for tab in tabs_data]
 
@@ -398,7 +385,7 @@ def tabs(tabs_data: List[Dict[str, Any]], default_active: int = 0, **kwargs):
         options=range(len(tabs_data)),
         format_func=lambda i: tab_labels[i],
         index=default_active,
-        key=f"tabs-{uuid.uuid4().hex[:8]}",
+        key=_uid("tabs", *tab_labels),
         label_visibility="collapsed"
     )
 
@@ -406,7 +393,7 @@ def tabs(tabs_data: List[Dict[str, Any]], default_active: int = 0, **kwargs):
         tabs_data[active_tab]['content']()
 
 
-def notification(message: str, type: str = "info", duration: Optional[int] = None, **kwargs):
+def notification(message: str, type: str = "info", duration: Optional[int] = None):
     """
     Show a notification toast.
 
@@ -414,23 +401,15 @@ def notification(message: str, type: str = "info", duration: Optional[int] = Non
         message: Notification message
         type: 'info', 'success', 'warning', 'error'
         duration: Auto-dismiss duration in seconds
-        **kwargs: Additional options
     """
-    icons = {
-        "info": "ℹ️",
-        "success": "✅",
-        "warning": "⚠️",
-        "error": "❌"
-    }
-
     if type == "success":
-        st.success(f"{icons[type]} {message}")
+        st.success(f"{_NOTIFICATION_PREFIXES['success']}{message}")
     elif type == "warning":
-        st.warning(f"{icons[type]} {message}")
+        st.warning(f"{_NOTIFICATION_PREFIXES['warning']}{message}")
     elif type == "error":
-        st.error(f"{icons[type]} {message}")
+        st.error(f"{_NOTIFICATION_PREFIXES['error']}{message}")
     else:
-        st.info(f"{icons[type]} {message}")
+        st.info(f"{_NOTIFICATION_PREFIXES['info']}{message}")
 
 
 # Advanced Form Controls
@@ -738,32 +717,31 @@ def carousel(images: List[str], captions: Optional[List[str]] = None,
     if captions is None:
         captions = ["" for _ in images]
 
-    # Carousel state
-    if 'carousel_index' not in st.session_state:
-        st.session_state.carousel_index = 0
+    # Carousel state: read once, work on a local copy, write back once
+    idx = st.session_state.setdefault('carousel_index', 0)
+    n = len(images)
 
     # Navigation
     col1, col2, col3 = st.columns([1, 3, 1])
     with col1:
         if st.button("◀", key="prev_carousel", help="Previous image"):
-            st.session_state.carousel_index = (st.session_state.carousel_index - 1) % len(images)
+            st.session_state.carousel_index = (idx - 1) % n
             st.rerun()
 
     with col2:
-        current_index = st.session_state.carousel_index
-        st.image(images[current_index], caption=captions[current_index], use_column_width=True)
-        st.markdown(f"<center><small>{current_index + 1} / {len(images)}</small></center>", unsafe_allow_html=True)
+        st.image(images[idx], caption=captions[idx], use_column_width=True)
+        st.markdown(f"<center><small>{idx + 1} / {n}</small></center>", unsafe_allow_html=True)
 
     with col3:
         if st.button("▶", key="next_carousel", help="Next image"):
-            st.session_state.carousel_index = (st.session_state.carousel_index + 1) % len(images)
+            st.session_state.carousel_index = (idx + 1) % n
             st.rerun()
 
     # Auto-play (simplified - would need JavaScript for real implementation)
-    if autoplay and len(images) > 1:
+    if autoplay and n > 1:
         import time
         time.sleep(interval / 1000)
-        st.session_state.carousel_index = (st.session_state.carousel_index + 1) % len(images)
+        st.session_state.carousel_index = (idx + 1) % n
         st.rerun()
 
 
@@ -934,6 +912,156 @@ def focus_trap(container_id: str, auto_focus: bool = True):
 
 
 # Enhanced Data Tables
+# Frames at least this long are searched with the numba kernel when available
+_NUMBA_SEARCH_MIN_ROWS = 50_000
+
+# Columns with values wider than this many UTF-8 bytes are searched with
+# pandas, bounding each encoded byte matrix at rows x width
+_NUMBA_MAX_WIDTH = 64
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to pandas string methods
+    _contains_kernel = None
+else:
+    @njit(parallel=True, cache=True)
+    def _contains_kernel(data, lengths, needle):
+        """Flag rows of a fixed-width byte matrix that contain ``needle``."""
+        n_rows = data.shape[0]
+        m = needle.shape[0]
+        out = np.zeros(n_rows, dtype=np.bool_)
+        for i in prange(n_rows):
+            for start in range(lengths[i] - m + 1):
+                found = True
+                for k in range(m):
+                    if data[i, start + k] != needle[k]:
+                        found = False
+                        break
+                if found:
+                    out[i] = True
+                    break
+        return out
+
+
+@st.cache_resource(show_spinner=False, max_entries=2, hash_funcs=_DF_HASH_FUNCS)
+def _encoded_columns(df: pd.DataFrame) -> List[Optional[tuple]]:
+    """
+    Upper-cased UTF-8 byte matrices (and string lengths) for every column.
+
+    Encoded once per DataFrame so each new search term is only a kernel scan.
+    Missing values get length 0, so they never match. Columns with values
+    wider than _NUMBA_MAX_WIDTH bytes are None and searched with pandas.
+    """
+    encoded = []
+    for col in df.columns:
+        values = _as_text(df[col]).str.upper().str.encode("utf-8")
+        lengths = values.str.len().fillna(0).to_numpy(dtype=np.int64)
+        width = int(lengths.max(initial=0))
+        if width > _NUMBA_MAX_WIDTH:
+            encoded.append(None)
+            continue
+        values = values.fillna(b"").to_numpy(dtype=f"S{max(width, 1)}")
+        data = values.view(np.uint8).reshape(len(values), values.dtype.itemsize)
+        encoded.append((data, lengths))
+    return encoded
+
+
+def _as_text(col: pd.Series) -> pd.Series:
+    """
+    Column as strings, keeping Arrow-backed string columns as they are.
+
+    Missing values stay missing rather than becoming 'nan' or 'None'.
+    """
+    if isinstance(col.dtype, pd.StringDtype):
+        return col
+    return col.astype(str).where(col.notna())
+
+
+def _text_contains(col: pd.Series, term: str) -> np.ndarray:
+    """Rows of a column containing ``term``, ignoring case; missing values never match."""
+    return _as_text(col).str.contains(term, case=False, regex=False, na=False).to_numpy()
+
+
+def _search_mask(df: pd.DataFrame, term: str) -> np.ndarray:
+    """
+    Row mask for a case-insensitive literal substring search across all columns.
+
+    Builds one boolean array per column and OR-reduces them, instead of
+    calling a Python lambda per row. Large frames use a parallel numba scan
+    when numba is installed.
+    """
+    if _contains_kernel is not None and len(df) >= _NUMBA_SEARCH_MIN_ROWS:
+        needle = np.frombuffer(term.upper().encode("utf-8"), dtype=np.uint8)
+        masks = [
+            _text_contains(df[col], term) if encoded is None else _contains_kernel(*encoded, needle)
+            for col, encoded in zip(df.columns, _encoded_columns(df))
+        ]
+    else:
+        masks = [_text_contains(df[col], term) for col in df.columns]
+    return np.logical_or.reduce(masks)
+
+
+def _filter_columns(dtypes: tuple, limit: int = 4) -> List[tuple]:
+    """
+    Pick the first ``limit`` filterable columns from ``(name, dtype)`` pairs.
+
+    Returns:
+        List of (column, kind) where kind is 'numeric' or 'categorical'
+    """
+    picked = []
+    for col, dtype in dtypes:
+        if pd.api.types.is_numeric_dtype(dtype):
+            picked.append((col, "numeric"))
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            picked.append((col, "categorical"))
+        if len(picked) == limit:
+            break
+    return picked
+
+
+def _column_stats(col: pd.Series, kind: str) -> tuple:
+    """
+    Filter widget stats for a column, each computed with a single scan.
+
+    Returns:
+        Tuple of (min, max, unique values); min/max are set for numeric
+        columns, unique values for categorical ones
+    """
+    if kind == "numeric":
+        return float(col.min()), float(col.max()), None
+    return None, None, col.unique()
+
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to CSV, writing in chunks straight into a byte buffer."""
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, chunksize=50_000)
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _excel_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to XLSX with xlsxwriter."""
+    # No constant_memory mode: it only keeps rows written in order, and
+    # to_excel writes column by column, so most cells would be dropped
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False)
+    return buf.getvalue()
+
+
+def _range_mask(df: pd.DataFrame, ranges: List[tuple]) -> np.ndarray:
+    """
+    One fused row mask for a list of ``(column, low, high)`` range filters.
+
+    Each bound check is a single vectorized ``between`` scan; a cached sorted
+    index cost more to hash and unpickle than the scan it replaced.
+    """
+    masks = [df[col].between(lo, hi, inclusive="both").to_numpy() for col, lo, hi in ranges]
+    return np.logical_and.reduce(masks)
+
+
 def advanced_data_table(df, editable_columns: Optional[List[str]] = None,
                        virtual_scroll: bool = False, filterable: bool = True,
                        searchable: bool = True, exportable: bool = True,
@@ -952,31 +1080,46 @@ def advanced_data_table(df, editable_columns: Optional[List[str]] = None,
     """
     table_key = key or "advanced_table"
 
+    # Search and filters each contribute a row mask over the full frame; they
+    # are AND-ed and applied with a single slice
+    masks = []
+
     # Search functionality
     if searchable:
         search_term = st.text_input("🔍 Search table...", key=f"search_{table_key}")
-        if search_term:
-            df = df[df.apply(lambda row: row.astype(str).str.contains(search_term, case=False).any(), axis=1)]
+        if search_term and len(df.columns):
+            masks.append(_search_mask(df, search_term))
 
     # Column filters
+    filters = {}
     if filterable:
-        with st.expander("🔧 Filters", expanded=False):
-            filter_cols = st.columns(min(len(df.columns), 4))
-            filters = {}
-
-            for i, col in enumerate(df.columns[:4]):  # Limit to first 4 columns for space
+        # Filter widgets (and the column scans behind them) only run while the
+        # panel is open; an st.expander would execute its body even when collapsed
+        filters_open_key = f"filters_open_{table_key}"
+        if st.button("🔧 Filters", key=f"toggle_filters_{table_key}"):
+            st.session_state[filters_open_key] = not st.session_state.get(filters_open_key, False)
+
+    if filterable and st.session_state.get(filters_open_key, False):
+        with st.container():
+            filter_specs = _filter_columns(tuple(df.dtypes.items()))  # At most 4, for space
+            filter_cols = st.columns(max(len(filter_specs), 1))
+
+            for i, (col, kind) in enumerate(filter_specs):
                 with filter_cols[i]:
-                    if df[col].dtype in ['int64', 'float64']:
+                    col_min, col_max, unique_vals = _column_stats(df[col], kind)
+                    if kind == "numeric":
                         min_val, max_val = st.slider(
                             f"Filter {col}",
-                            float(df[col].min()),
-                            float(df[col].max()),
-                            (float(df[col].min()), float(df[col].max())),
+                            col_min,
+                            col_max,
+                            (col_min, col_max),
                             key=f"filter_{col}_{table_key}"
                         )
-                        filters[col] = (min_val, max_val)
-                    elif df[col].dtype == 'object':
-                        unique_vals = df[col].unique()
+                        # A slider left at the full range only drops missing
+                        # values; skip it when the column has none
+                        if (min_val, max_val) != (col_min, col_max) or df[col].hasnans:
+                            filters[col] = (min_val, max_val)
+                    elif kind == "categorical":
                         selected = st.multiselect(
                             f"Filter {col}",
                             unique_vals,
@@ -985,45 +1128,66 @@ def advanced_data_table(df, editable_columns: Optional[List[str]] = None,
                         if selected:
                             filters[col] = selected
 
-    # Apply filters
+    # Apply search and filters in one pass
+    ranges = [(col, *val) for col, val in filters.items() if isinstance(val, tuple)]
+    if ranges:  # Numeric ranges
+        masks.append(_range_mask(df, ranges))
     for col, filter_val in filters.items():
-        if isinstance(filter_val, tuple):  # Numeric range
-            df = df[(df[col] >= filter_val[0]) & (df[col] <= filter_val[1])]
-        else:  # Categorical filter
-            df = df[df[col].isin(filter_val)]
+        if not isinstance(filter_val, tuple):  # Categorical filter
+            masks.append(df[col].isin(filter_val).to_numpy())
+    if masks:
+        df = df.iloc[np.logical_and.reduce(masks)]
 
     # Editable columns (demo - changes not persisted)
     if editable_columns:
         st.info("✏️ Double-click cells to edit (demo - changes not persisted)")
 
-    # Export functionality
+    # Export functionality (serialized lazily, only once the user asks for it)
     if exportable:
+        export_ready_key = f"export_ready_{table_key}"
         col1, col2, col3 = st.columns([2, 1, 1])
-        with col2:
-            if st.download_button(
-                "📥 CSV",
-                df.to_csv(index=False),
-                "data.csv",
-                "text/csv",
-                key=f"csv_{table_key}"
-            ):
-                st.success("CSV downloaded!")
-        with col3:
-            if st.download_button(
-                "📊 Excel",
-                df.to_excel(index=False).getvalue(),
-                "data.xlsx",
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key=f"excel_{table_key}"
-            ):
-                st.success("Excel downloaded!")
+        with col1:
+            prepare = st.button("📦 Prepare export", key=f"prepare_export_{table_key}")
+
+        # An export stays ready only for the rows it was prepared for, so a
+        # change of filters or data asks for a new one
+        if prepare or export_ready_key in st.session_state:
+            fingerprint = _df_fingerprint(df)
+            if prepare:
+                st.session_state[export_ready_key] = fingerprint
+            elif st.session_state[export_ready_key] != fingerprint:
+                del st.session_state[export_ready_key]
+
+        if export_ready_key in st.session_state:
+            with col2:
+                if st.download_button(
+                    "📥 CSV",
+                    _csv_bytes(df),
+                    "data.csv",
+                    "text/csv",
+                    key=f"csv_{table_key}"
+                ):
+                    st.success("CSV downloaded!")
+            with col3:
+                try:
+                    excel_data = _excel_bytes(df)
+                except ImportError:
+                    st.error("xlsxwriter is required for Excel export. Install with: pip install xlsxwriter")
+                else:
+                    if st.download_button(
+                        "📊 Excel",
+                        excel_data,
+                        "data.xlsx",
+                        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        key=f"excel_{table_key}"
+                    ):
+                        st.success("Excel downloaded!")
 
     # Display table
     if virtual_scroll and len(df) > 100:
-        # Virtual scroll implementation (simplified)
-        start_row = st.slider("📏 Scroll to row", 0, len(df)-50, 0, key=f"scroll_{table_key}")
-        end_row = min(start_row + 50, len(df))
-        st.dataframe(df.iloc[start_row:end_row], use_container_width=True)
-        st.text(f"Showing rows {start_row} - {end_row} of {len(df)}")
+        # st.dataframe sends the frame to the browser once as Arrow and its grid
+        # only renders the visible rows, so scrolling never triggers a rerun
+        st.dataframe(df, use_container_width=True, height=400)
+        st.text(f"Showing {len(df)} rows")
     else:
         st.dataframe(df, use_container_width=True)
\ No newline at end of file
@@ -5,8 +5,183 @@ Provides flexible grid-based layouts, component positioning, and dashboard templ
 """
 
 import streamlit as st
-from typing import List, Optional, Union, Dict, Any, Tuple
-import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Optional, Union, Dict, Any, Tuple, Mapping
+
+from ._utils import _collect_css, _emit_css, _inject_css, _uid
+
+
+_FLOATING_POSITIONS = MappingProxyType({
+    "top-left": "top: 10px; left: 10px;",
+    "top-right": "top: 10px; right: 10px;",
+    "bottom-left": "bottom: 10px; left: 10px;",
+    "bottom-right": "bottom: 10px; right: 10px;"
+})
+
+_OVERLAY_POSITIONS = MappingProxyType({
+    "center": "top: 50%; left: 50%; transform: translate(-50%, -50%);",
+    "top": "top: 10%; left: 50%; transform: translateX(-50%);",
+    "bottom": "bottom: 10%; left: 50%; transform: translateX(-50%);",
+    "left": "top: 50%; left: 10%; transform: translateY(-50%);",
+    "right": "top: 50%; right: 10%; transform: translateY(-50%);"
+})
+
+# Arrow pointing the way an expanded sidebar moves when collapsed
+_TOGGLE_ICONS = MappingProxyType({
+    "left": "◀",
+    "right": "▶",
+    "top": "▲",
+    "bottom": "▼"
+})
+
+_DASHBOARD_TEMPLATES = MappingProxyType({
+    "analytics": MappingProxyType({
+        "header": MappingProxyType({"height": "10%", "components": ("title", "filters")}),
+        "sidebar": MappingProxyType({"width": "20%", "components": ("navigation", "settings")}),
+        "main": MappingProxyType({"width": "80%", "components": ("charts", "metrics")}),
+    }),
+    "admin": MappingProxyType({
+        "header": MappingProxyType({"height": "8%", "components": ("logo", "user_menu")}),
+        "sidebar": MappingProxyType({"width": "15%", "components": ("menu", "quick_actions")}),
+        "content": MappingProxyType({"width": "85%", "components": ("dashboard", "tables")}),
+    }),
+    "explorer": MappingProxyType({
+        "toolbar": MappingProxyType({"height": "5%", "components": ("search", "filters")}),
+        "content": MappingProxyType({"height": "95%", "components": ("data_view", "details")}),
+    })
+})
+
+# Static rules shared by every grid item, floating panel and absolutely
+# positioned element, sent once per run; per-call values are set inline on
+# the element
+_LAYOUT_CSS = """
+.stp-grid-item {
+    padding: 1rem;
+    border-radius: 8px;
+    background: var(--surface-color, #f8f9fa);
+    border: 1px solid var(--text-secondary-color, #e0e0e0);
+}
+.stp-floating-panel {
+    position: fixed;
+    background: var(--surface-color, white);
+    border: 1px solid var(--text-secondary-color, #ddd);
+    border-radius: 8px;
+    padding: 1rem;
+    z-index: 1000;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    overflow: auto;
+}
+.stp-abs-position {
+    position: absolute;
+    padding: 1rem;
+}
+"""
+
+# Per-call templates for %-formatting; CSS braces stay as-is, a literal % is %%
+_GRID_ITEM_HTML = '<div class="stp-grid-item" style="grid-area: %s;">'
+_FLOATING_PANEL_HTML = '<div class="stp-floating-panel" style="%s width: %s; height: %s;">'
+_ABS_POSITION_HTML = ('<div class="stp-abs-position" '
+                      'style="top: %s; left: %s; right: %s; bottom: %s; z-index: %s;">')
+
+_GRID_CONTAINER_CSS_TEMPLATE = """
+#%(id)s {
+    display: grid;
+    %(template)s
+    gap: %(gap)s;
+    height: %(height)s;
+    width: 100%%;
+    padding: 1rem;
+    box-sizing: border-box;
+}
+"""
+
+_OVERLAY_PANEL_CSS = """
+#%(id)s {
+    position: fixed;
+    %(pos)s
+    width: %(width)s;
+    height: %(height)s;
+    background: var(--surface-color, white);
+    border: 1px solid var(--text-secondary-color, #ddd);
+    border-radius: 8px;
+    padding: 1.5rem;
+    z-index: 10000;
+    box-shadow: 0 10px 25px rgba(0,0,0,0.2);
+    max-height: 90vh;
+    overflow-y: auto;
+}
+"""
+
+_OVERLAY_BACKDROP_CSS = """
+#%(id)s-backdrop {
+    position: fixed;
+    top: 0;
+    left: 0;
+    width: 100vw;
+    height: 100vh;
+    z-index: 9999;
+    backdrop-filter: blur(4px);
+    background: rgba(0,0,0,0.5);
+}
+"""
+
+# Non-modal overlays carry no backdrop rule or element
+_OVERLAY_TMPL_PLAIN = "<style>" + _OVERLAY_PANEL_CSS + '</style><div id="%(id)s">'
+_OVERLAY_TMPL_MODAL = ("<style>" + _OVERLAY_PANEL_CSS + _OVERLAY_BACKDROP_CSS + "</style>"
+                       '<div id="%(id)s-backdrop"></div><div id="%(id)s">')
+
+_SIDEBAR_CSS_TEMPLATE = """
+<style>
+#%(id)s {
+    %(pos)s
+    background: var(--surface-color, #ffffff);
+    border: 1px solid var(--text-secondary-color, #e0e0e0);
+    border-radius: 0;
+    padding: 1rem;
+    z-index: 999;
+    box-shadow: 2px 0 4px rgba(0,0,0,0.1);
+    overflow-y: auto;
+    transition: transform 0.3s ease;
+}
+
+#%(id)s .sidebar-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin-bottom: 1rem;
+    padding-bottom: 0.5rem;
+    border-bottom: 1px solid var(--text-secondary-color, #e0e0e0);
+}
+
+#%(id)s .sidebar-toggle {
+    position: absolute;
+    %(toggle)s
+    background: var(--primary-color, #6366f1);
+    color: white;
+    border: none;
+    border-radius: 50%%;
+    width: 32px;
+    height: 32px;
+    cursor: pointer;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    z-index: 1000;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.2);
+    font-size: 16px;
+    line-height: 1;
+    padding: 0;
+    margin: 0;
+}
+
+.main-content {
+    transition: margin 0.3s ease;
+    padding: 1rem;
+}
+</style>
+"""
 
 
 def grid_layout(rows: int, cols: int, gap: str = "1rem", **kwargs) -> List[List]:
@@ -22,13 +197,10 @@ def grid_layout(rows: int, cols: int, gap: str = "1rem", **kwargs) -> List[List]
     Returns:
         List of lists containing column objects
     """
-    # For now, use Streamlit's columns
-    # TODO: Implement custom CSS Grid layout
-    grid = []
-    for _ in range(rows):
-        row = st.columns(cols)
-        grid.append(row)
-    return grid
+    # Streamlit elements cannot be placed inside markdown HTML, so a CSS grid
+    # (see css_grid_layout) cannot hold the returned cells; one st.columns call
+    # per row is the fewest deltas that still yields usable containers
+    return [st.columns(cols) for _ in range(rows)]
 
 
 def css_grid_layout(grid_template: str, gap: str = "1rem", height: str = "auto", **kwargs) -> str:
@@ -44,26 +216,34 @@ def css_grid_layout(grid_template: str, gap: str = "1rem", height: str = "auto",
     Returns:
         Unique container ID for placing content
     """
-    container_id = f"grid-container-{uuid.uuid4().hex[:8]}"
-
-    style = f"""
-    <style>
-    #{container_id} {{
-        display: grid;
-        {grid_template}
-        gap: {gap};
-        height: {height};
-        width: 100%;
-        padding: 1rem;
-        box-sizing: border-box;
-    }}
-    </style>
-    """
+    container_id = _uid("grid-container", grid_template, gap, height)
 
-    st.markdown(style, unsafe_allow_html=True)
+    _emit_css(_GRID_CONTAINER_CSS_TEMPLATE % {"id": container_id, "template": grid_template, "gap": gap, "height": height})
     return container_id
 
 
+@contextmanager
+def layout_batch():
+    """
+    Collect the stylesheets emitted by layout helpers inside the block and
+    send them as a single <style> element when the block exits.
+
+    Example:
+        with layout_batch():
+            grid = css_grid_layout("grid-template-columns: 1fr 1fr;")
+            grid_item(grid, "1 / 1", left)
+            grid_item(grid, "1 / 2", right)
+    """
+    with _collect_css() as buffer:
+        try:
+            yield
+        finally:
+            if buffer:
+                # st.markdown rather than components.html: styles inside the
+                # component iframe would not reach the app page
+                st.markdown(f"<style>{''.join(buffer)}</style>", unsafe_allow_html=True)
+
+
 def grid_item(container_id: str, grid_area: str, content: Any, **kwargs):
     """
     Place content in a specific grid area.
@@ -74,27 +254,13 @@ def grid_item(container_id: str, grid_area: str, content: Any, **kwargs):
         content: Content to place
         **kwargs: Additional styling
     """
-    item_id = f"grid-item-{uuid.uuid4().hex[:8]}"
-
-    style = f"""
-    <style>
-    #{item_id} {{
-        grid-area: {grid_area};
-        padding: 1rem;
-        border-radius: 8px;
-        background: var(--surface-color, #f8f9fa);
-        border: 1px solid var(--text-secondary-color, #e0e0e0);
-    }}
-    </style>
-    """
-
-    st.markdown(style, unsafe_allow_html=True)
-    st.markdown(f'<div id="{item_id}">', unsafe_allow_html=True)
+    _inject_css("layouts", _LAYOUT_CSS)
+    st.markdown(_GRID_ITEM_HTML % grid_area, unsafe_allow_html=True)
     content()
     st.markdown('</div>', unsafe_allow_html=True)
 
 
-def dashboard_template(template_type: str = "analytics") -> Dict[str, Any]:
+def dashboard_template(template_type: str = "analytics") -> Mapping[str, Any]:
     """
     Get a pre-built dashboard template configuration.
 
@@ -102,25 +268,9 @@ def dashboard_template(template_type: str = "analytics") -> Dict[str, Any]:
         template_type: Type of template ('analytics', 'admin', 'explorer')
 
     Returns:
-        Dictionary with layout configuration
+        Read-only mapping with layout configuration (shared, do not mutate)
     """
-    templates = {
-        "analytics": {
-            "header": {"height": "10%", "components": ["title", "filters"]},
-            "sidebar": {"width": "20%", "components": ["navigation", "settings"]},
-            "main": {"width": "80%", "components": ["charts", "metrics"]},
-        },
-        "admin": {
-            "header": {"height": "8%", "components": ["logo", "user_menu"]},
-            "sidebar": {"width": "15%", "components": ["menu", "quick_actions"]},
-            "content": {"width": "85%", "components": ["dashboard", "tables"]},
-        },
-        "explorer": {
-            "toolbar": {"height": "5%", "components": ["search", "filters"]},
-            "content": {"height": "95%", "components": ["data_view", "details"]},
-        }
-    }
-    return templates.get(template_type, templates["analytics"])
+    return _DASHBOARD_TEMPLATES.get(template_type, _DASHBOARD_TEMPLATES["analytics"])
 
 
 def floating_panel(content: Any, position: str = "top-right", width: str = "300px", height: str = "200px", **kwargs):
@@ -134,35 +284,9 @@ def floating_panel(content: Any, position: str = "top-right", width: str = "300p
         height: Panel height
         **kwargs: Additional styling
     """
-    panel_id = f"floating-panel-{uuid.uuid4().hex[:8]}"
-
-    position_styles = {
-        "top-left": "top: 10px; left: 10px;",
-        "top-right": "top: 10px; right: 10px;",
-        "bottom-left": "bottom: 10px; left: 10px;",
-        "bottom-right": "bottom: 10px; right: 10px;"
-    }
-
-    style = f"""
-    <style>
-    #{panel_id} {{
-        position: fixed;
-        {position_styles.get(position, position_styles['top-right'])}
-        width: {width};
-        height: {height};
-        background: var(--surface-color, white);
-        border: 1px solid var(--text-secondary-color, #ddd);
-        border-radius: 8px;
-        padding: 1rem;
-        z-index: 1000;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        overflow: auto;
-    }}
-    </style>
-    """
-
-    st.markdown(style, unsafe_allow_html=True)
-    st.markdown(f'<div id="{panel_id}">', unsafe_allow_html=True)
+    _inject_css("layouts", _LAYOUT_CSS)
+    position_style = _FLOATING_POSITIONS.get(position, _FLOATING_POSITIONS["top-right"])
+    st.markdown(_FLOATING_PANEL_HTML % (position_style, width, height), unsafe_allow_html=True)
     content()
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -177,24 +301,8 @@ def absolute_position(content: Any, top: str = "auto", left: str = "auto", right
         z_index: Z-index for layering
         **kwargs: Additional styling
     """
-    element_id = f"abs-position-{uuid.uuid4().hex[:8]}"
-
-    style = f"""
-    <style>
-    #{element_id} {{
-        position: absolute;
-        top: {top};
-        left: {left};
-        right: {right};
-        bottom: {bottom};
-        z-index: {z_index};
-        padding: 1rem;
-    }}
-    </style>
-    """
-
-    st.markdown(style, unsafe_allow_html=True)
-    st.markdown(f'<div id="{element_id}">', unsafe_allow_html=True)
+    _inject_css("layouts", _LAYOUT_CSS)
+    st.markdown(_ABS_POSITION_HTML % (top, left, right, bottom, z_index), unsafe_allow_html=True)
     content()
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -213,22 +321,14 @@ def collapsible_section(title: str, content: Any, expanded: bool = False, **kwar
         content()
 
 
-def flexible_sidebar(position: str = "left", width: str = "300px", collapsible: bool = True,
-                    title: str = "", content: Any = None, **kwargs):
+@lru_cache(maxsize=64)
+def _sidebar_position_css(position: str, width: str) -> Tuple[str, str, str]:
     """
-    Create a flexible sidebar that can be positioned anywhere.
+    Position-specific CSS fragments for an expanded flexible sidebar.
 
-    Args:
-        position: Position ('left', 'right', 'top', 'bottom')
-        width: Sidebar width (for left/right) or height (for top/bottom)
-        collapsible: Whether sidebar can be collapsed
-        title: Sidebar title
-        content: Content function to render
-        **kwargs: Additional styling options
+    Returns:
+        Tuple of (position_style, toggle_style, main_margin)
     """
-    sidebar_id = f"flex-sidebar-{uuid.uuid4().hex[:8]}"
-
-    # Position-specific styles
     if position == "left":
         position_style = f"""
         position: fixed;
@@ -276,93 +376,60 @@ def flexible_sidebar(position: str = "left", width: str = "300px", collapsible:
     else:
         raise ValueError(f"Invalid position: {position}. Use 'left', 'right', 'top', or 'bottom'.")
 
-    # Collapsible functionality
-    if collapsible:
-        if f"sidebar_collapsed_{sidebar_id}" not in st.session_state:
-            st.session_state[f"sidebar_collapsed_{sidebar_id}"] = False
-
-        collapsed = st.session_state[f"sidebar_collapsed_{sidebar_id}"]
-
-        if position in ["left", "right"]:
-            transform = "translateX(-100%)" if collapsed else "translateX(0)"
-        else:  # top/bottom
-            transform = "translateY(-100%)" if collapsed else "translateY(0)"
-
-        position_style = position_style.replace("transform: translateX(0);", f"transform: {transform};")
-        position_style = position_style.replace("transform: translateY(0);", f"transform: {transform};")
-
-        if not collapsed:
-            main_margin = main_margin
-        else:
-            main_margin = ""
-
-    # CSS styles
-    style = f"""
-    <style>
-    #{sidebar_id} {{
-        {position_style}
-        background: var(--surface-color, #ffffff);
-        border: 1px solid var(--text-secondary-color, #e0e0e0);
-        border-radius: 0;
-        padding: 1rem;
-        z-index: 999;
-        box-shadow: 2px 0 4px rgba(0,0,0,0.1);
-        overflow-y: auto;
-        transition: transform 0.3s ease;
-    }}
-
-    #{sidebar_id} .sidebar-header {{
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        margin-bottom: 1rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 1px solid var(--text-secondary-color, #e0e0e0);
-    }}
-
-    #{sidebar_id} .sidebar-toggle {{
-        position: absolute;
-        {toggle_style}
-        background: var(--primary-color, #6366f1);
-        color: white;
-        border: none;
-        border-radius: 50%;
-        width: 32px;
-        height: 32px;
-        cursor: pointer;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        z-index: 1000;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-        font-size: 16px;
-        line-height: 1;
-        padding: 0;
-        margin: 0;
-    }}
-
-    .main-content {{
-        transition: margin 0.3s ease;
-        padding: 1rem;
-    }}
-    </style>
+    return position_style, toggle_style, main_margin
+
+
+def flexible_sidebar(position: str = "left", width: str = "300px", collapsible: bool = True,
+                    title: str = "", content: Any = None, **kwargs):
+    """
+    Create a flexible sidebar that can be positioned anywhere.
+
+    Args:
+        position: Position ('left', 'right', 'top', 'bottom')
+        width: Sidebar width (for left/right) or height (for top/bottom)
+        collapsible: Whether sidebar can be collapsed
+        title: Sidebar title
+        content: Content function to render
+        **kwargs: Additional styling options
     """
+    # Checked up front: a collapsed sidebar returns before building its styles
+    if position not in _TOGGLE_ICONS:
+        raise ValueError(f"Invalid position: {position}. Use 'left', 'right', 'top', or 'bottom'.")
 
-    st.markdown(style, unsafe_allow_html=True)
+    # Keyed by the sidebar's arguments so its collapsed state survives reruns
+    sidebar_id = _uid("flex-sidebar", position, width, title)
 
-    # Handle toggle button click
+    # Collapsible functionality
+    collapsed = False
     if collapsible:
-        toggle_key = f"toggle_{sidebar_id}"
-        if st.button("", key=toggle_key, help="Toggle sidebar"):
-            current_state = st.session_state.get(f"sidebar_collapsed_{sidebar_id}", False)
-            st.session_state[f"sidebar_collapsed_{sidebar_id}"] = not current_state
-            st.rerun()
+        state_key = f"sidebar_collapsed_{sidebar_id}"
+        collapsed = st.session_state.get(state_key, False)
+
+        # One widget drives the state; a click already triggers a rerun, so it
+        # is applied to this run instead of requesting another with st.rerun()
+        if st.button("", key=f"toggle_{sidebar_id}", help="Toggle sidebar"):
+            collapsed = not collapsed
+            st.session_state[state_key] = collapsed
+
+    # Reserve the sidebar's slots whether or not it is shown, so elements
+    # after it keep their tree position (and frontend state) across toggles
+    markup_slot = st.empty()
+    body = st.container()
+
+    # A collapsed sidebar is off-screen, so its slots are left empty
+    if collapsed:
+        return sidebar_id
 
-    # Sidebar content
-    sidebar_html = f'<div id="{sidebar_id}">'
+    # Position-specific styles
+    position_style, toggle_style, main_margin = _sidebar_position_css(position, width)
+
+    style = _SIDEBAR_CSS_TEMPLATE % {"id": sidebar_id, "pos": position_style, "toggle": toggle_style}
+
+    # Sidebar content, sent together with its styles in one markdown call
+    sidebar_html = style + f'<div id="{sidebar_id}">'
 
     if collapsible:
-        toggle_icon = "▶" if st.session_state.get(f"sidebar_collapsed_{sidebar_id}", False) else "◀" if position == "left" else "◀" if position == "right" else "▼" if position == "top" else "▲"
+        toggle_icon = _TOGGLE_ICONS[position]
         sidebar_html += f'''
         <div class="sidebar-toggle">
             {toggle_icon}
@@ -370,30 +437,23 @@ def flexible_sidebar(position: str = "left", width: str = "300px", collapsible:
         '''
 
     if title:
-        sidebar_html += f'<div class="sidebar-header"><h3>{title}</h3>'
-
-        if collapsible:
-            close_key = f"close_{sidebar_id}"
-            if st.button("✕", key=close_key, help="Close sidebar"):
-                st.session_state[f"sidebar_collapsed_{sidebar_id}"] = True
-                st.rerun()
-
-        sidebar_html += '</div>'
+        sidebar_html += f'<div class="sidebar-header"><h3>{title}</h3></div>'
 
     sidebar_html += '</div>'  # Close sidebar div
 
-    st.markdown(sidebar_html, unsafe_allow_html=True)
+    markup_slot.markdown(sidebar_html, unsafe_allow_html=True)
 
     # Render content inside sidebar using Streamlit components
-    if content and not st.session_state.get(f"sidebar_collapsed_{sidebar_id}", False):
-        with st.container():
+    if content:
+        with body:
             content()
 
     return sidebar_id
 
 
 def create_widget_panel(position: str = "left", size: str = "300px", widgets: List[Dict] = None,
-                       collapsible: bool = True, title: str = "Widgets", **kwargs):
+                       collapsible: bool = True, title: str = "Widgets", lazy: bool = False,
+                       key: Optional[str] = None, **kwargs):
     """
     Create a widget panel with multiple widgets that can be positioned flexibly.
 
@@ -403,21 +463,38 @@ def create_widget_panel(position: str = "left", size: str = "300px", widgets: Li
         widgets: List of widget dictionaries with 'title', 'content', and 'expanded' keys
         collapsible: Whether panel can be collapsed
         title: Panel title
+        lazy: Open widgets with a toggle instead of an expander so closed
+            widgets' content is not run at all
+        key: Optional key for the lazy toggles; panels with the same title
+            and position on one page need different keys
         **kwargs: Additional options
     """
     if widgets is None:
         widgets = []
 
+    # Split once into parallel lists so rendering only touches what it needs
+    titles = [w.get('title', f'Widget {i+1}') for i, w in enumerate(widgets)]
+    expanded = [w.get('expanded', False) for w in widgets]
+    contents = [w.get('content') for w in widgets]
+
+    def render_content(widget_content):
+        if widget_content:
+            if callable(widget_content):
+                widget_content()
+            else:
+                st.write(widget_content)
+
     def render_widgets():
-        for i, widget in enumerate(widgets):
-            with st.expander(widget.get('title', f'Widget {i+1}'),
-                           expanded=widget.get('expanded', False)):
-                widget_content = widget.get('content')
-                if widget_content:
-                    if callable(widget_content):
-                        widget_content()
-                    else:
-                        st.write(widget_content)
+        for i, (widget_title, widget_expanded, widget_content) in enumerate(zip(titles, expanded, contents)):
+            if lazy:
+                # st.expander runs its body even while closed; a toggle's
+                # value is known up front, so closed widgets are skipped
+                if st.toggle(widget_title, value=widget_expanded, key=_uid("wpanel", key, position, title, i, widget_title)):
+                    with st.container():
+                        render_content(widget_content)
+            else:
+                with st.expander(widget_title, expanded=widget_expanded):
+                    render_content(widget_content)
 
     return flexible_sidebar(
         position=position,
@@ -429,7 +506,8 @@ def create_widget_panel(position: str = "left", size: str = "300px", widgets: Li
     )
 
 
-def responsive_layout(mobile_breakpoint: int = 768):
+@lru_cache(maxsize=8)
+def responsive_layout(mobile_breakpoint: int = 768) -> Mapping[str, Any]:
     """
     Create a responsive layout system that adapts to screen size.
 
@@ -437,20 +515,33 @@ def responsive_layout(mobile_breakpoint: int = 768):
         mobile_breakpoint: Screen width breakpoint for mobile layout
 
     Returns:
-        Layout configuration dictionary
+        Read-only layout configuration mapping (shared, do not mutate)
     """
     # This would typically use JavaScript to detect screen size
     # For now, return a basic configuration
-    return {
+    return MappingProxyType({
         "mobile_breakpoint": mobile_breakpoint,
         "sidebar_position": "top" if mobile_breakpoint > 768 else "left",
         "sidebar_size": "200px",
         "main_margin": "auto"
+    })
+
+
+@lru_cache(maxsize=64)
+def _overlay_markup(overlay_id: str, position: str, width: str, height: str, modal: bool) -> str:
+    """Styles, optional backdrop and opening tag for an overlay panel."""
+    template = _OVERLAY_TMPL_MODAL if modal else _OVERLAY_TMPL_PLAIN
+    return template % {
+        "id": overlay_id,
+        "pos": _OVERLAY_POSITIONS.get(position, _OVERLAY_POSITIONS["center"]),
+        "width": width,
+        "height": height,
     }
 
 
 def overlay_panel(content: Any, trigger_element: str = None, position: str = "center",
-                 width: str = "500px", height: str = "auto", modal: bool = True, **kwargs):
+                 width: str = "500px", height: str = "auto", modal: bool = True,
+                 key: Optional[str] = None, **kwargs):
     """
     Create an overlay panel that appears over content.
 
@@ -461,58 +552,14 @@ def overlay_panel(content: Any, trigger_element: str = None, position: str = "ce
         width: Panel width
         height: Panel height
         modal: Whether to show as modal (blocks background)
+        key: Optional unique key; gives the overlay a fixed ID independent of
+            call order
         **kwargs: Additional styling
     """
-    overlay_id = f"overlay-panel-{uuid.uuid4().hex[:8]}"
-
-    # Position styles
-    position_styles = {
-        "center": "top: 50%; left: 50%; transform: translate(-50%, -50%);",
-        "top": "top: 10%; left: 50%; transform: translateX(-50%);",
-        "bottom": "bottom: 10%; left: 50%; transform: translateX(-50%);",
-        "left": "top: 50%; left: 10%; transform: translateY(-50%);",
-        "right": "top: 50%; right: 10%; transform: translateY(-50%);"
-    }
-
-    backdrop_style = "backdrop-filter: blur(4px); background: rgba(0,0,0,0.5);" if modal else ""
-
-    style = f"""
-    <style>
-    #{overlay_id} {{
-        position: fixed;
-        {position_styles.get(position, position_styles['center'])}
-        width: {width};
-        height: {height};
-        background: var(--surface-color, white);
-        border: 1px solid var(--text-secondary-color, #ddd);
-        border-radius: 8px;
-        padding: 1.5rem;
-        z-index: 10000;
-        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-        max-height: 90vh;
-        overflow-y: auto;
-    }}
-
-    #{overlay_id}-backdrop {{
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100vw;
-        height: 100vh;
-        z-index: 9999;
-        {backdrop_style}
-    }}
-    </style>
-    """
-
-    st.markdown(style, unsafe_allow_html=True)
-
-    # Backdrop for modal
-    if modal:
-        st.markdown(f'<div id="{overlay_id}-backdrop"></div>', unsafe_allow_html=True)
+    overlay_id = f"overlay-panel-{key}" if key else _uid("overlay-panel", position, width, height, modal)
 
-    # Overlay content
-    st.markdown(f'<div id="{overlay_id}">', unsafe_allow_html=True)
+    # Styles, modal backdrop and the overlay's opening tag in one markdown call
+    st.markdown(_overlay_markup(overlay_id, position, width, height, modal), unsafe_allow_html=True)
     content()
     st.markdown('</div>', unsafe_allow_html=True)
 
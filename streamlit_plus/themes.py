@@ -5,7 +5,93 @@ Provides comprehensive theming with light/dark modes, custom palettes, and desig
 """
 
 import streamlit as st
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, Mapping
+
+from ._utils import _run_state
+
+
+_LIGHT_COLORS = MappingProxyType({
+    "primary": "#007bff",
+    "secondary": "#6c757d",
+    "success": "#28a745",
+    "danger": "#dc3545",
+    "warning": "#ffc107",
+    "info": "#17a2b8",
+    "background": "#ffffff",
+    "surface": "#f8f9fa",
+    "text": "#212529",
+    "text_secondary": "#6c757d"
+})
+
+_DARK_COLORS = MappingProxyType({
+    "primary": "#007bff",
+    "secondary": "#6c757d",
+    "success": "#28a745",
+    "danger": "#dc3545",
+    "warning": "#ffc107",
+    "info": "#17a2b8",
+    "background": "#121212",
+    "surface": "#1e1e1e",
+    "text": "#ffffff",
+    "text_secondary": "#b0b0b0"
+})
+
+_DEFAULT_TYPOGRAPHY = MappingProxyType({
+    "font_family": "'Inter', -apple-system, BlinkMacSystemFont, sans-serif",
+    "h1": "2.5rem",
+    "h2": "2rem",
+    "h3": "1.75rem",
+    "h4": "1.5rem",
+    "h5": "1.25rem",
+    "h6": "1rem",
+    "body": "1rem",
+    "small": "0.875rem"
+})
+
+_DEFAULT_SPACING = MappingProxyType({
+    "xs": "0.25rem",
+    "sm": "0.5rem",
+    "md": "1rem",
+    "lg": "1.5rem",
+    "xl": "3rem"
+})
+
+
+@st.cache_data(show_spinner=False)
+def _build_theme_css(mode: str, colors: Tuple[Tuple[str, str], ...],
+                     typography: Tuple[Tuple[str, str], ...]) -> str:
+    """Build the theme stylesheet once per distinct palette and typography."""
+    colors = dict(colors)
+    typography = dict(typography)
+    return f"""
+    <style>
+    :root {{
+        --primary-color: {colors['primary']};
+        --secondary-color: {colors['secondary']};
+        --success-color: {colors['success']};
+        --danger-color: {colors['danger']};
+        --warning-color: {colors['warning']};
+        --info-color: {colors['info']};
+        --background-color: {colors['background']};
+        --surface-color: {colors['surface']};
+        --text-color: {colors['text']};
+        --text-secondary-color: {colors['text_secondary']};
+        --font-family: {typography['font_family']};
+    }}
+
+    body {{
+        background-color: var(--background-color) !important;
+        color: var(--text-color) !important;
+        font-family: var(--font-family) !important;
+    }}
+
+    .stButton > button {{
+        background-color: var(--primary-color) !important;
+        color: white !important;
+    }}
+    </style>
+    """
 
 
 class Theme:
@@ -18,87 +104,29 @@ class Theme:
         self.typography = self._get_default_typography()
         self.spacing = self._get_default_spacing()
 
-    def _get_default_colors(self) -> Dict[str, str]:
-        if self.mode == "dark":
-            return {
-                "primary": "#007bff",
-                "secondary": "#6c757d",
-                "success": "#28a745",
-                "danger": "#dc3545",
-                "warning": "#ffc107",
-                "info": "#17a2b8",
-                "background": "#121212",
-                "surface": "#1e1e1e",
-                "text": "#ffffff",
-                "text_secondary": "#b0b0b0"
-            }
-        else:
-            return {
-                "primary": "#007bff",
-                "secondary": "#6c757d",
-                "success": "#28a745",
-                "danger": "#dc3545",
-                "warning": "#ffc107",
-                "info": "#17a2b8",
-                "background": "#ffffff",
-                "surface": "#f8f9fa",
-                "text": "#212529",
-                "text_secondary": "#6c757d"
-            }
-
-    def _get_default_typography(self) -> Dict[str, str]:
-        return {
-            "font_family": "'Inter', -apple-system, BlinkMacSystemFont, sans-serif",
-            "h1": "2.5rem",
-            "h2": "2rem",
-            "h3": "1.75rem",
-            "h4": "1.5rem",
-            "h5": "1.25rem",
-            "h6": "1rem",
-            "body": "1rem",
-            "small": "0.875rem"
-        }
-
-    def _get_default_spacing(self) -> Dict[str, str]:
-        return {
-            "xs": "0.25rem",
-            "sm": "0.5rem",
-            "md": "1rem",
-            "lg": "1.5rem",
-            "xl": "3rem"
-        }
+    # Defaults are shared read-only mappings; custom_theme copies on write
+    def _get_default_colors(self) -> Mapping[str, str]:
+        return _DARK_COLORS if self.mode == "dark" else _LIGHT_COLORS
+
+    def _get_default_typography(self) -> Mapping[str, str]:
+        return _DEFAULT_TYPOGRAPHY
+
+    def _get_default_spacing(self) -> Mapping[str, str]:
+        return _DEFAULT_SPACING
 
     def apply(self):
         """Apply the theme to the Streamlit app."""
-        css = f"""
-        <style>
-        :root {{
-            --primary-color: {self.colors['primary']};
-            --secondary-color: {self.colors['secondary']};
-            --success-color: {self.colors['success']};
-            --danger-color: {self.colors['danger']};
-            --warning-color: {self.colors['warning']};
-            --info-color: {self.colors['info']};
-            --background-color: {self.colors['background']};
-            --surface-color: {self.colors['surface']};
-            --text-color: {self.colors['text']};
-            --text-secondary-color: {self.colors['text_secondary']};
-            --font-family: {self.typography['font_family']};
-        }}
-
-        body {{
-            background-color: var(--background-color) !important;
-            color: var(--text-color) !important;
-            font-family: var(--font-family) !important;
-        }}
-
-        .stButton > button {{
-            background-color: var(--primary-color) !important;
-            color: white !important;
-        }}
-        </style>
-        """
-        st.markdown(css, unsafe_allow_html=True)
+        fingerprint = (self.mode,
+                       tuple(sorted(self.colors.items())),
+                       tuple(sorted(self.typography.items())))
+        # Each rerun rebuilds the page, so the stylesheet must be sent once
+        # per run; repeated applies of the same theme within a run are skipped
+        state = _run_state()
+        if state is not None:
+            if state.get("theme") == fingerprint:
+                return
+            state["theme"] = fingerprint
+        st.markdown(_build_theme_css(*fingerprint), unsafe_allow_html=True)
 
 
 # Global theme instance
@@ -117,6 +145,11 @@ def get_theme() -> Theme:
     return _current_theme
 
 
+def ensure_theme():
+    """Apply the current theme if it has not been applied in this run yet."""
+    _current_theme.apply()
+
+
 def toggle_dark_mode():
     """Toggle between light and dark mode."""
     global _current_theme
@@ -141,9 +174,9 @@ def custom_theme(colors: Optional[Dict[str, str]] = None,
     """
     theme = Theme("custom", _current_theme.mode)
     if colors:
-        theme.colors.update(colors)
+        theme.colors = {**theme.colors, **colors}
     if typography:
-        theme.typography.update(typography)
+        theme.typography = {**theme.typography, **typography}
     if spacing:
-        theme.spacing.update(spacing)
+        theme.spacing = {**theme.spacing, **spacing}
     return theme
\ No newline at end of file
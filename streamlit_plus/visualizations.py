@@ -5,10 +5,182 @@ Provides interactive charting libraries and advanced visualization features.
 """
 
 import streamlit as st
-from typing import Optional, List, Dict, Any, Callable, Union
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Callable, Sequence, Union
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-import uuid
+
+try:
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import plotly.io as pio
+except ImportError:  # plotly is optional; chart helpers report it when missing
+    px = go = pio = None
+
+from ._utils import _DF_HASH_FUNCS, _inject_css, _uid
+from .components import _as_text
+
+
+# CSS class and arrow prefix of a metric delta, keyed by its sign
+_DELTA_STYLES = MappingProxyType({
+    1: ("positive", "↗️ +"),
+    -1: ("negative", "↘️ "),
+    0: ("neutral", "→ ")
+})
+
+_DELTA_HTML = '<div class="stp-metric-delta %s">%s%s</div>'
+
+# Shared by every metric card; sent once per run instead of once per card
+_METRIC_CSS = """
+.stp-metric {
+    background: var(--surface-color, white);
+    border: 1px solid var(--text-secondary-color, #e0e0e0);
+    border-radius: 8px;
+    padding: 1.5rem;
+    text-align: center;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    margin: 0.5rem;
+}
+.stp-metric-value {
+    font-size: 2rem;
+    font-weight: bold;
+    color: var(--primary-color, #007bff);
+    margin: 0.5rem 0;
+}
+.stp-metric-title {
+    font-size: 0.875rem;
+    color: var(--text-secondary-color, #6c757d);
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+}
+.stp-metric-delta {
+    font-size: 0.75rem;
+    margin-top: 0.5rem;
+}
+.stp-metric-delta.positive { color: var(--success-color, #28a745); }
+.stp-metric-delta.negative { color: var(--danger-color, #dc3545); }
+.stp-metric-delta.neutral { color: var(--text-secondary-color, #6c757d); }
+.stp-metric-grid {
+    display: grid;
+    gap: 0.5rem;
+}
+"""
+
+
+_CHART_TYPES = ("line", "bar", "scatter", "area")
+
+# Line and scatter charts with more points than this use Scattergl traces
+_WEBGL_MIN_POINTS = 3000
+
+
+# Time series longer than this are downsampled before plotting
+_DOWNSAMPLE_TARGET = 3000
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of ``n_out`` points that keep
+    the visual shape of the series ``(x, y)``.
+
+    ``x`` must be sorted. The first and last points are always kept; each
+    bucket in between keeps the point forming the largest triangle with the
+    previously kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def _downsample(data: pd.DataFrame, x_col: str, y_cols: List[str], n_target: int = _DOWNSAMPLE_TARGET) -> pd.DataFrame:
+    """
+    Rows of a sorted time series kept by LTTB for any of the ``y_cols``.
+
+    Only the visible shape is preserved; zooming in shows the same points.
+    """
+    x = (data[x_col] - data[x_col].iloc[0]).dt.total_seconds().to_numpy()
+    keep = [
+        _lttb_indices(x, np.nan_to_num(data[col].to_numpy(dtype=float)), n_target)
+        for col in y_cols
+    ]
+    return data.iloc[np.unique(np.concatenate(keep))]
+
+
+@lru_cache(maxsize=8)
+def _chart_template(name: str):
+    """
+    Colours and fonts of the named Plotly template, built once per name.
+    """
+    return go.layout.Template(pio.templates[name])
+
+
+@st.cache_data(show_spinner=False, ttl=300, max_entries=64, hash_funcs=_DF_HASH_FUNCS)
+def _build_figure(data: pd.DataFrame, chart_type: str, x_col: str, y_cols: tuple, title: str,
+                  template_name: str):
+    """
+    Build the Plotly figure for interactive_chart.
+
+    Cached on the data, chart options and Plotly template name, so reruns
+    that leave them unchanged skip the pandas-to-Plotly conversion.
+    """
+    y_cols = list(y_cols)
+    is_time_series = pd.api.types.is_datetime64_any_dtype(data[x_col])
+    if (chart_type == "line" and is_time_series and len(data) > _DOWNSAMPLE_TARGET
+            and data[x_col].is_monotonic_increasing):
+        data = _downsample(data, x_col, y_cols)
+
+    # Large line/scatter charts are drawn as WebGL traces instead of SVG paths
+    render_mode = "webgl" if len(data) > _WEBGL_MIN_POINTS else "svg"
+    template = _chart_template(template_name)
+    if chart_type == "line":
+        # Traces are built straight from the column arrays; px.line would melt
+        # the frame to long form and build per-row hover data first
+        trace = go.Scattergl if render_mode == "webgl" else go.Scatter
+        x_values = data[x_col].to_numpy()
+        fig = go.Figure(
+            [trace(x=x_values, y=data[col].to_numpy(), name=str(col), mode="lines") for col in y_cols],
+            layout=dict(
+                title=dict(text=title),
+                template=template,
+                xaxis=dict(title=dict(text=str(x_col))),
+                yaxis=dict(title=dict(text=str(y_cols[0]) if len(y_cols) == 1 else "value")),
+            ),
+        )
+    elif chart_type == "bar":
+        fig = px.bar(data, x=x_col, y=y_cols, title=title, template=template)
+    elif chart_type == "scatter":
+        fig = px.scatter(data, x=x_col, y=y_cols[0] if y_cols else None, title=title,
+                         render_mode=render_mode, template=template)
+    else:
+        fig = px.area(data, x=x_col, y=y_cols[0] if y_cols else None, title=title, template=template)
+
+    # Set explicitly rather than in the template, where Streamlit's own chart
+    # theme could override them
+    fig.update_layout(
+        hovermode='x unified',
+        dragmode='zoom',
+        showlegend=True
+    )
+
+    # Add range slider for time series
+    if is_time_series:
+        fig.update_layout(xaxis=dict(rangeslider=dict(visible=True)))
+
+    return fig
 
 
 def interactive_chart(data: pd.DataFrame, chart_type: str = "line", x_col: str = None, y_col: str = None,
@@ -24,10 +196,7 @@ def interactive_chart(data: pd.DataFrame, chart_type: str = "line", x_col: str =
         title: Chart title
         **kwargs: Additional chart options
     """
-    try:
-        import plotly.express as px
-        import plotly.graph_objects as go
-    except ImportError:
+    if px is None:
         st.error("Plotly is required for interactive charts. Install with: pip install plotly")
         return
 
@@ -40,30 +209,25 @@ def interactive_chart(data: pd.DataFrame, chart_type: str = "line", x_col: str =
     else:
         y_cols = y_col
 
-    if chart_type == "line":
-        fig = px.line(data, x=x_col, y=y_cols, title=title)
-    elif chart_type == "bar":
-        fig = px.bar(data, x=x_col, y=y_cols, title=title)
-    elif chart_type == "scatter":
-        fig = px.scatter(data, x=x_col, y=y_cols[0] if y_cols else None, title=title)
-    elif chart_type == "area":
-        fig = px.area(data, x=x_col, y=y_cols[0] if y_cols else None, title=title)
-    else:
+    if chart_type not in _CHART_TYPES:
         st.error(f"Unsupported chart type: {chart_type}")
         return
 
-    # Add interactive features
-    fig.update_layout(
-        hovermode='x unified',
-        dragmode='zoom',
-        showlegend=True
-    )
+    fig = _build_figure(data, chart_type, x_col, tuple(y_cols), title, pio.templates.default)
+    st.plotly_chart(fig, use_container_width=True, **kwargs)
 
-    # Add range slider for time series
-    if pd.api.types.is_datetime64_any_dtype(data[x_col]):
-        fig.update_xaxes(rangeslider_visible=True)
 
-    st.plotly_chart(fig, use_container_width=True, **kwargs)
+@st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+def _hierarchy_totals(data: pd.DataFrame, hierarchy: tuple, value_col: str) -> pd.DataFrame:
+    """
+    Sum of ``value_col`` per leaf of ``hierarchy``.
+
+    The sunburst only needs leaf totals, so Plotly receives one row per
+    leaf instead of the full frame.
+    """
+    return (data.groupby(list(hierarchy), observed=True, sort=False, dropna=False)[value_col]
+            .sum()
+            .reset_index())
 
 
 def drill_down_chart(data: pd.DataFrame, hierarchy: List[str], value_col: str, **kwargs):
@@ -76,15 +240,13 @@ def drill_down_chart(data: pd.DataFrame, hierarchy: List[str], value_col: str, *
         value_col: Column name for values
         **kwargs: Additional options
     """
-    try:
-        import plotly.express as px
-    except ImportError:
+    if px is None:
         st.error("Plotly is required for drill-down charts. Install with: pip install plotly")
         return
 
-    # For simplicity, create a sunburst chart
+    # For simplicity, create a sunburst chart over the leaf-level totals
     fig = px.sunburst(
-        data,
+        _hierarchy_totals(data, tuple(hierarchy), value_col),
         path=hierarchy,
         values=value_col,
         title="Drill-down Visualization"
@@ -106,9 +268,7 @@ def animated_data_chart(data: pd.DataFrame, x_col: str, y_col: str, animation_co
         chart_type: Chart type
         **kwargs: Additional options
     """
-    try:
-        import plotly.express as px
-    except ImportError:
+    if px is None:
         st.error("Plotly is required for animated charts. Install with: pip install plotly")
         return
 
@@ -125,6 +285,21 @@ def animated_data_chart(data: pd.DataFrame, x_col: str, y_col: str, animation_co
     st.plotly_chart(fig, use_container_width=True)
 
 
+def _delta_html(delta: Optional[Union[int, float]]) -> str:
+    """Delta line of a metric card, or an empty string without a delta."""
+    if delta is None:
+        return ""
+    return _DELTA_HTML % (*_DELTA_STYLES[int(delta > 0) - int(delta < 0)], delta)
+
+
+def _metric_card_html(title: str, value: Union[int, float, str], delta_html: str, icon: str = "") -> str:
+    """Markup of a single metric card (styled by _METRIC_CSS)."""
+    return (f'<div class="stp-metric">'
+            f'<div class="stp-metric-title">{icon} {title}</div>'
+            f'<div class="stp-metric-value">{value}</div>'
+            f'{delta_html}</div>')
+
+
 def metric_card(title: str, value: Union[int, float, str], delta: Optional[Union[int, float]] = None,
                delta_color: str = "normal", icon: str = "", **kwargs):
     """
@@ -138,68 +313,52 @@ def metric_card(title: str, value: Union[int, float, str], delta: Optional[Union
         icon: Icon emoji or text
         **kwargs: Additional styling
     """
-    card_id = f"metric-{uuid.uuid4().hex[:8]}"
-
-    # Format delta
-    delta_text = ""
-    delta_class = ""
-    if delta is not None:
-        if delta > 0:
-            delta_text = f"↗️ +{delta}"
-            delta_class = "positive"
-        elif delta < 0:
-            delta_text = f"↘️ {delta}"
-            delta_class = "negative"
-        else:
-            delta_text = f"→ {delta}"
-            delta_class = "neutral"
-
-    style = f"""
-    <style>
-    #{card_id} {{
-        background: var(--surface-color, white);
-        border: 1px solid var(--text-secondary-color, #e0e0e0);
-        border-radius: 8px;
-        padding: 1.5rem;
-        text-align: center;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin: 0.5rem;
-    }}
-    #{card_id} .metric-value {{
-        font-size: 2rem;
-        font-weight: bold;
-        color: var(--primary-color, #007bff);
-        margin: 0.5rem 0;
-    }}
-    #{card_id} .metric-title {{
-        font-size: 0.875rem;
-        color: var(--text-secondary-color, #6c757d);
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }}
-    #{card_id} .metric-delta {{
-        font-size: 0.75rem;
-        margin-top: 0.5rem;
-    }}
-    #{card_id} .positive {{ color: var(--success-color, #28a745); }}
-    #{card_id} .negative {{ color: var(--danger-color, #dc3545); }}
-    #{card_id} .neutral {{ color: var(--text-secondary-color, #6c757d); }}
-    </style>
-    """
-
-    st.markdown(style, unsafe_allow_html=True)
-
-    st.markdown(f"""
-    <div id="{card_id}">
-        <div class="metric-title">{icon} {title}</div>
-        <div class="metric-value">{value}</div>
-        {f'<div class="metric-delta {delta_class}">{delta_text}</div>' if delta_text else ''}
-    </div>
-    """, unsafe_allow_html=True)
+    _inject_css("metric_card", _METRIC_CSS)
+    st.markdown(_metric_card_html(title, value, _delta_html(delta), icon), unsafe_allow_html=True)
+
+
+# Tables at least this long are paged on the server instead of sent whole
+_PAGINATE_MIN_ROWS = 50_000
+
+
+def _table_search_mask(data: pd.DataFrame, search: str, all_columns: bool = False) -> np.ndarray:
+    """
+    Row mask for a case-insensitive literal search of a data table.
+
+    Only text and categorical columns are searched unless ``all_columns`` is
+    set, since stringifying numeric columns rarely finds anything useful.
+    """
+    text_cols = data.select_dtypes(include=["object", "string", "category"]).columns.tolist()
+    cols = text_cols
+    if all_columns:
+        # Text columns are the likeliest matches, so they are scanned first
+        cols = text_cols + [col for col in data.columns if col not in text_cols]
+
+    mask = np.zeros(len(data), dtype=bool)
+    for col in cols:
+        mask |= _as_text(data[col]).str.contains(search, case=False, regex=False, na=False).to_numpy()
+        if mask.all():
+            break
+    return mask
+
+
+@st.cache_data(show_spinner=False, max_entries=16, hash_funcs=_DF_HASH_FUNCS)
+def _table_view(data: pd.DataFrame, search: str, sort_by: str, search_all: bool = False) -> np.ndarray:
+    """
+    Positions of the rows of ``data`` matching ``search``, ordered by ``sort_by``.
+
+    Cached so paging through the same search and sort reuses the result.
+    """
+    positions = np.flatnonzero(_table_search_mask(data, search, search_all)) if search else np.arange(len(data))
+    if sort_by != "None":
+        keys = data[sort_by].iloc[positions].reset_index(drop=True)
+        positions = positions[keys.sort_values(kind="mergesort").index.to_numpy()]
+    return positions
 
 
 def data_table(data: pd.DataFrame, sortable: bool = True, filterable: bool = True,
-              pagination: bool = True, page_size: int = 10, **kwargs):
+              pagination: bool = True, page_size: int = 10, key: Optional[str] = None,
+              search_all_columns: bool = False, **kwargs):
     """
     Create an enhanced data table with sorting, filtering, and pagination.
 
@@ -209,6 +368,9 @@ def data_table(data: pd.DataFrame, sortable: bool = True, filterable: bool = Tru
         filterable: Enable column filtering
         pagination: Enable pagination
         page_size: Number of rows per page
+        key: Optional key for the table's widgets; tables with the same
+            columns on one page need different keys
+        search_all_columns: Also search numeric and date columns
         **kwargs: Additional options
     """
     try:
@@ -220,82 +382,101 @@ def data_table(data: pd.DataFrame, sortable: bool = True, filterable: bool = Tru
     # For now, use Streamlit's built-in dataframe with some enhancements
     # A full implementation would use a custom component
 
+    # Widget keys must be identical on every rerun for their values to persist
+    table_key = _uid("data-table", key, *data.columns)
+
+    # st.dataframe virtualizes scrolling in the browser; paging on the server
+    # is only worth it for frames too large to send whole
+    paginate = pagination and len(data) >= _PAGINATE_MIN_ROWS
+
     col1, col2, col3 = st.columns([2, 1, 1])
 
     with col1:
-        search = st.text_input("Search", key=f"search-{uuid.uuid4().hex[:8]}")
+        search = st.text_input("Search", key=f"search-{table_key}")
 
     with col2:
         if sortable:
             sort_by = st.selectbox("Sort by", ["None"] + list(data.columns),
-                                 key=f"sort-{uuid.uuid4().hex[:8]}")
+                                 key=f"sort-{table_key}")
         else:
             sort_by = "None"
 
     with col3:
-        if pagination:
+        if paginate:
             page_size = st.selectbox("Page size", [5, 10, 25, 50, 100],
-                                   index=1, key=f"page-size-{uuid.uuid4().hex[:8]}")
+                                   index=1, key=f"page-size-{table_key}")
         else:
             page_size = len(data)
 
-    # Apply filters
-    filtered_data = data.copy()
-    if search:
-        mask = filtered_data.astype(str).apply(lambda x: x.str.contains(search, case=False)).any(axis=1)
-        filtered_data = filtered_data[mask]
-
-    # Apply sorting
-    if sort_by != "None":
-        filtered_data = filtered_data.sort_values(sort_by)
+    # Filter and sort row positions only; rows are taken for the visible page.
+    # Without a search or sort the view is the frame itself, so the cached
+    # lookup (and the hashing of the whole frame) is skipped
+    reordered = bool(search) or sort_by != "None"
+    positions = _table_view(data, search, sort_by, search_all_columns) if reordered else None
+    n_rows = len(positions) if reordered else len(data)
 
     # Apply pagination
-    if pagination:
-        total_pages = len(filtered_data) // page_size + 1
+    if paginate:
+        total_pages = max(1, -(-n_rows // page_size))
         page = st.number_input("Page", min_value=1, max_value=total_pages, value=1,
-                             key=f"page-{uuid.uuid4().hex[:8]}")
+                             key=f"page-{table_key}")
         start_idx = (page - 1) * page_size
         end_idx = start_idx + page_size
-        display_data = filtered_data.iloc[start_idx:end_idx]
-    else:
-        display_data = filtered_data
+        page_rows = positions[start_idx:end_idx] if reordered else slice(start_idx, end_idx)
+        st.dataframe(data.iloc[page_rows], use_container_width=True)
+        return
+
+    display_data = data.iloc[positions] if reordered else data
+    st.dataframe(display_data, use_container_width=True, height=400)
+
 
-    st.dataframe(display_data, use_container_width=True)
+def _column_profile(dtypes: tuple) -> tuple:
+    """
+    Column choices for chart_with_controls from ``(name, dtype)`` pairs.
+
+    Returns:
+        Tuple of (all columns, numeric columns)
+    """
+    numeric_cols = [
+        col for col, dtype in dtypes
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+    ]
+    return [col for col, _ in dtypes], numeric_cols
 
 
-def chart_with_controls(data: pd.DataFrame, chart_types: List[str] = None, **kwargs):
+def chart_with_controls(data: pd.DataFrame, chart_types: List[str] = None, key: Optional[str] = None, **kwargs):
     """
     Create a chart with interactive controls.
 
     Args:
         data: DataFrame with chart data
         chart_types: Available chart types
+        key: Optional key for the control widgets; charts with the same
+            columns on one page need different keys
         **kwargs: Additional options
     """
     if chart_types is None:
         chart_types = ["line", "bar", "scatter", "area"]
 
+    chart_key = _uid("chart-controls", key, *data.columns)
+
     col1, col2 = st.columns([1, 3])
 
     with col1:
         st.subheader("Controls")
         chart_type = st.selectbox("Chart Type", chart_types,
-                                key=f"chart-type-{uuid.uuid4().hex[:8]}")
+                                key=f"chart-type-{chart_key}")
 
         # Column selectors
-        numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = data.select_dtypes(include=['object', 'category']).columns.tolist()
+        x_options, y_options = _column_profile(tuple(data.dtypes.items()))
 
-        x_options = data.columns.tolist()
-        y_options = numeric_cols
-
-        x_col = st.selectbox("X-axis", x_options, key=f"x-col-{uuid.uuid4().hex[:8]}")
+        x_col = st.selectbox("X-axis", x_options, key=f"x-col-{chart_key}")
         y_col = st.multiselect("Y-axis", y_options, default=y_options[:1] if y_options else [],
-                             key=f"y-col-{uuid.uuid4().hex[:8]}")
+                             key=f"y-col-{chart_key}")
 
         # Additional options
-        show_trendline = st.checkbox("Show trendline", key=f"trend-{uuid.uuid4().hex[:8]}")
-        show_grid = st.checkbox("Show grid", value=True, key=f"grid-{uuid.uuid4().hex[:8]}")
+        show_trendline = st.checkbox("Show trendline", key=f"trend-{chart_key}")
+        show_grid = st.checkbox("Show grid", value=True, key=f"grid-{chart_key}")
 
     with col2:
         if y_col:
@@ -305,6 +486,39 @@ def chart_with_controls(data: pd.DataFrame, chart_types: List[str] = None, **kwa
             st.info("Please select at least one Y-axis column")
 
 
+def compute_kpis(current: pd.DataFrame, previous: Optional[pd.DataFrame] = None,
+                 agg: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Aggregate KPI values, and deltas against a previous period, for kpi_dashboard.
+
+    Each period is reduced with a single DataFrame.agg call and all deltas
+    come from one vectorized subtraction.
+
+    Args:
+        current: Data for the current period
+        previous: Data for the comparison period
+        agg: Mapping of column to aggregation ('sum', 'mean', ...);
+            defaults to summing every numeric column
+
+    Returns:
+        List of KPI dictionaries with 'title', 'value' and 'delta' keys
+    """
+    if agg is None:
+        agg = {col: "sum" for col in current.select_dtypes(include=[np.number]).columns}
+    titles = list(agg)
+
+    values = current.agg(agg).reindex(titles).to_numpy(dtype=float)
+    if previous is not None:
+        deltas = (values - previous.agg(agg).reindex(titles).to_numpy(dtype=float)).tolist()
+    else:
+        deltas = [None] * len(titles)
+
+    return [
+        {"title": title, "value": value, "delta": delta}
+        for title, value, delta in zip(titles, values.tolist(), deltas)
+    ]
+
+
 def kpi_dashboard(kpis: List[Dict[str, Any]], columns: int = 3, **kwargs):
     """
     Create a KPI dashboard with metric cards.
@@ -314,19 +528,38 @@ def kpi_dashboard(kpis: List[Dict[str, Any]], columns: int = 3, **kwargs):
         columns: Number of columns in the grid
         **kwargs: Additional options
     """
-    rows = (len(kpis) + columns - 1) // columns
-
-    for row in range(rows):
-        cols = st.columns(columns)
-        for col in range(columns):
-            idx = row * columns + col
-            if idx < len(kpis):
-                kpi = kpis[idx]
-                with cols[col]:
-                    metric_card(
-                        title=kpi['title'],
-                        value=kpi['value'],
-                        delta=kpi.get('delta'),
-                        delta_color=kpi.get('delta_color', 'normal'),
-                        icon=kpi.get('icon', '')
-                    )
\ No newline at end of file
+    kpi_dashboard_soa(
+        titles=[kpi['title'] for kpi in kpis],
+        values=[kpi['value'] for kpi in kpis],
+        deltas=[kpi.get('delta') for kpi in kpis],
+        icons=[kpi.get('icon', '') for kpi in kpis],
+        columns=columns
+    )
+
+
+def kpi_dashboard_soa(titles: Sequence[str], values: Sequence[Any],
+                      deltas: Optional[Sequence[Optional[float]]] = None,
+                      icons: Optional[Sequence[str]] = None, columns: int = 3):
+    """
+    Create a KPI dashboard from parallel sequences instead of per-KPI dicts.
+
+    Args:
+        titles: KPI titles
+        values: KPI values
+        deltas: Change values (None entries show no delta)
+        icons: Icon emoji or text per KPI
+        columns: Number of columns in the grid
+    """
+    n = len(titles)
+    if icons is None:
+        icons = [""] * n
+
+    delta_parts = [""] * n if deltas is None else list(map(_delta_html, deltas))
+
+    _inject_css("metric_card", _METRIC_CSS)
+
+    # The whole grid is one markdown element instead of a column and a
+    # markdown call per card
+    cards = "".join(map(_metric_card_html, titles, values, delta_parts, icons))
+    st.markdown(f'<div class="stp-metric-grid" style="grid-template-columns: repeat({columns}, 1fr);">'
+                f'{cards}</div>', unsafe_allow_html=True)
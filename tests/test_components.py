@@ -22,5 +22,138 @@ def test_custom_theme():
     assert custom.colors["primary"] == "#ff0000"
 
 
+def test_button_opts_frozen():
+    """Test ButtonOpts is immutable and shareable."""
+    from dataclasses import FrozenInstanceError
+    from streamlit_plus.components import ButtonOpts
+    opts = ButtonOpts(variant="outlined")
+    assert opts.size == "medium"
+    with pytest.raises(FrozenInstanceError):
+        opts.variant = "text"
+
+
 # Note: Testing Streamlit components requires special setup
-# These are basic unit tests for now
\ No newline at end of file
+# These are basic unit tests for now
+
+def test_helpers_render_in_app():
+    """Test helpers render inside a real script run, including a rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import streamlit_plus as stp
+        with stp.layout_batch():
+            stp.badge("New")
+            stp.badge("Beta")
+        stp.button("Save")
+        stp.metric_card("Users", 10, delta=2)
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    first_key = at.button[0].key
+    at.run()
+    assert not at.exception
+    assert at.button[0].key == first_key
+
+
+def test_excel_export_round_trip():
+    """Test the XLSX export keeps every cell."""
+    import io
+    import pandas as pd
+    from streamlit_plus.components import _excel_bytes
+    pytest.importorskip("xlsxwriter")
+    pytest.importorskip("openpyxl")
+    df = pd.DataFrame({"name": ["a", "b", "c"], "score": [1.5, 2.0, 3.25], "n": [1, 2, 3]})
+    restored = pd.read_excel(io.BytesIO(_excel_bytes(df)))
+    pd.testing.assert_frame_equal(restored, df)
+
+
+def test_filter_columns_extension_dtypes():
+    """Test filter column picking accepts pandas extension dtypes."""
+    import pandas as pd
+    from streamlit_plus.components import _filter_columns
+    df = pd.DataFrame({
+        "cat": pd.Categorical(["a", "b"]),
+        "n": pd.array([1, None], dtype="Int64"),
+        "ts": pd.date_range("2024-01-01", periods=2, tz="UTC"),
+        "name": ["x", "y"],
+    })
+    picked = _filter_columns(tuple(df.dtypes.items()))
+    assert ("n", "numeric") in picked
+    assert ("name", "categorical") in picked
+
+
+def test_search_mask_numba_matches_pandas(monkeypatch):
+    """Test the numba search path returns the same rows as pandas."""
+    import numpy as np
+    import pandas as pd
+    pytest.importorskip("numba")
+    from streamlit_plus import components
+    df = pd.DataFrame({
+        "name": ["Alpha", None, "beta", "ALPHABET", "nano"],
+        "note": ["x" * 100 + "alpha", "nan", "", "gamma", np.nan],
+        "score": [1.5, np.nan, 3.0, 10.0, 2.5],
+    })
+    monkeypatch.setattr(components, "_NUMBA_SEARCH_MIN_ROWS", 0)
+    for term in ("alpha", "nan", "None", "1.5", "Ø"):
+        fast = components._search_mask(df, term)
+        with monkeypatch.context() as m:
+            m.setattr(components, "_contains_kernel", None)
+            slow = components._search_mask(df, term)
+        assert fast.tolist() == slow.tolist(), term
+
+
+def test_component_css_sent_once_per_run():
+    """Test badges, chips and progress bars share one stylesheet per run."""
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import streamlit_plus as stp
+        stp.badge("New")
+        stp.badge("Beta", variant="success")
+        stp.chip("Tag")
+        stp.progress_bar(0.5)
+
+    at = AppTest.from_function(app).run()
+    for _ in range(2):
+        assert not at.exception
+        bodies = [md.value for md in at.markdown]
+        assert len(bodies) == 5
+        assert sum("<style>" in body for body in bodies) == 1
+        at.run()
+
+
+def test_range_filter_drops_missing_values():
+    """Test numeric filters drop NaN rows at the full range and when narrowed."""
+    import numpy as np
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import numpy as np
+        import pandas as pd
+        import streamlit_plus as stp
+        df = pd.DataFrame({"score": [1.0, np.nan, 3.0, 4.0]})
+        stp.advanced_data_table(df, searchable=False, exportable=False, key="t")
+
+    at = AppTest.from_function(app).run()
+    at.button(key="toggle_filters_t").click().run()
+    assert not at.exception
+    full = at.dataframe[0].value["score"]
+    assert len(full) == 3 and not np.isnan(full).any()
+
+    at.slider(key="filter_score_t").set_range(1.0, 3.0).run()
+    assert at.dataframe[0].value["score"].tolist() == [1.0, 3.0]
+
+
+def test_notification_accepts_non_str_messages():
+    """Test notification formats numbers and exceptions like an f-string."""
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import streamlit_plus as stp
+        stp.notification(42, type="success")
+        stp.notification(ValueError("bad input"), type="error")
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    assert at.success[0].value == "✅ 42"
+    assert at.error[0].value == "❌ bad input"
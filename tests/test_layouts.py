@@ -0,0 +1,73 @@
+"""
+Tests for Streamlit++ layouts.
+"""
+
+import pytest
+from streamlit_plus.layouts import dashboard_template
+
+
+def test_dashboard_template_fallback():
+    """Test unknown template types fall back to analytics."""
+    assert dashboard_template("unknown") is dashboard_template("analytics")
+    assert "sidebar" in dashboard_template("admin")
+
+
+def test_dashboard_template_read_only():
+    """Test the shared template cannot be mutated by callers."""
+    template = dashboard_template("analytics")
+    with pytest.raises(TypeError):
+        template["header"] = {}
+
+
+def test_sidebar_position_css():
+    """Test expanded sidebar CSS per position and rejection of bad positions."""
+    from streamlit_plus.layouts import _sidebar_position_css
+    position_style, toggle_style, main_margin = _sidebar_position_css("left", "250px")
+    assert "width: 250px;" in position_style
+    assert toggle_style == "left: 100%;"
+    assert main_margin == "margin-left: 250px;"
+    assert _sidebar_position_css("top", "80px")[2] == "margin-top: 80px;"
+    with pytest.raises(ValueError):
+        _sidebar_position_css("middle", "250px")
+
+
+def test_responsive_layout_shared():
+    """Test responsive layouts are memoized per breakpoint."""
+    from streamlit_plus.layouts import responsive_layout
+    assert responsive_layout(1024) is responsive_layout(1024)
+    assert responsive_layout(1024)["sidebar_position"] == "top"
+    assert responsive_layout()["sidebar_position"] == "left"
+
+
+def test_layout_css_sent_once_per_run():
+    """Test layout helpers share one stylesheet per run without layout_batch."""
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import streamlit as st
+        import streamlit_plus as stp
+        grid = stp.css_grid_layout("grid-template-columns: 1fr 1fr;")
+        stp.grid_item(grid, "1 / 1", lambda: st.write("left"))
+        stp.grid_item(grid, "1 / 2", lambda: st.write("right"))
+        stp.floating_panel(lambda: st.write("panel"))
+        stp.absolute_position(lambda: st.write("pinned"), top="0")
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    bodies = [md.value for md in at.markdown]
+    assert sum(".stp-grid-item" in body for body in bodies) == 1
+
+
+def test_flexible_sidebar_rejects_bad_position_when_collapsed():
+    """Test an invalid position raises even while the sidebar is collapsed."""
+    from streamlit.testing.v1 import AppTest
+    from streamlit_plus._utils import _uid
+
+    def app():
+        import streamlit_plus as stp
+        stp.flexible_sidebar(position="middle")
+
+    at = AppTest.from_function(app)
+    at.session_state[f"sidebar_collapsed_{_uid('flex-sidebar', 'middle', '300px', '')}"] = True
+    at.run()
+    assert at.exception
@@ -0,0 +1,37 @@
+"""
+Tests for Streamlit++ themes.
+"""
+
+import pytest
+from streamlit_plus.themes import Theme, custom_theme
+
+
+def test_default_palettes_shared_and_read_only():
+    """Test Theme instances share the read-only default palettes."""
+    assert Theme().colors is Theme().colors
+    assert Theme(mode="dark").colors["background"] == "#121212"
+    with pytest.raises(TypeError):
+        Theme().colors["primary"] = "#000000"
+
+
+def test_custom_theme_copies_on_write():
+    """Test custom_theme overrides without touching the shared defaults."""
+    theme = custom_theme(colors={"primary": "#ff0000"})
+    assert theme.colors["primary"] == "#ff0000"
+    assert Theme().colors["primary"] == "#007bff"
+
+
+def test_ensure_theme_once_per_run():
+    """Test repeated ensure_theme calls send the theme once per run."""
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import streamlit_plus as stp
+        stp.ensure_theme()
+        stp.ensure_theme()
+
+    at = AppTest.from_function(app).run()
+    for _ in range(2):
+        assert not at.exception
+        assert len(at.markdown) == 1
+        at.run()
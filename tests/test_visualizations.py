@@ -0,0 +1,82 @@
+"""
+Tests for Streamlit++ visualizations.
+"""
+
+import numpy as np
+from streamlit_plus.visualizations import _lttb_indices
+
+
+def test_lttb_indices():
+    """Test LTTB keeps the endpoints and returns sorted, unique positions."""
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 100)
+    idx = _lttb_indices(x, y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_indices_short_series():
+    """Test series already below the target are returned whole."""
+    x = np.arange(5, dtype=float)
+    assert list(_lttb_indices(x, x, 10)) == [0, 1, 2, 3, 4]
+
+
+def test_compute_kpis():
+    """Test KPI values and deltas are aggregated per column."""
+    import pandas as pd
+    from streamlit_plus.visualizations import compute_kpis
+    current = pd.DataFrame({"sales": [10, 20], "users": [3, 5], "region": ["a", "b"]})
+    previous = pd.DataFrame({"sales": [5, 5], "users": [4, 6], "region": ["a", "b"]})
+    kpis = compute_kpis(current, previous)
+    assert [k["title"] for k in kpis] == ["sales", "users"]
+    assert kpis[0]["value"] == 30 and kpis[0]["delta"] == 20
+    assert kpis[1]["delta"] == -2
+    assert compute_kpis(current, agg={"users": "mean"})[0] == {"title": "users", "value": 4.0, "delta": None}
+
+
+def test_column_profile_categorical():
+    """Test chart column choices accept categorical and nullable columns."""
+    import pandas as pd
+    from streamlit_plus.visualizations import _column_profile
+    df = pd.DataFrame({
+        "region": pd.Categorical(["a", "b"]),
+        "sales": pd.array([1, None], dtype="Int64"),
+        "flag": [True, False],
+    })
+    all_cols, numeric_cols = _column_profile(tuple(df.dtypes.items()))
+    assert all_cols == ["region", "sales", "flag"]
+    assert numeric_cols == ["sales"]
+
+
+def test_metric_css_sent_once_per_run():
+    """Test metric cards share one stylesheet per run."""
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import streamlit_plus as stp
+        stp.metric_card("Users", 10, delta=2)
+        stp.metric_card("Revenue", 5.5, delta=-1)
+        stp.kpi_dashboard_soa(["Orders"], [3], [0])
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    bodies = [md.value for md in at.markdown]
+    assert sum("<style>" in body for body in bodies) == 1
+    assert len(bodies) == 4
+
+
+def test_data_tables_with_same_columns_use_keys():
+    """Test two tables with the same columns render side by side given keys."""
+    from streamlit.testing.v1 import AppTest
+
+    def app():
+        import pandas as pd
+        import streamlit_plus as stp
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        stp.data_table(df, key="first")
+        stp.data_table(df.iloc[::-1], key="second")
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    assert len(at.text_input) == 2